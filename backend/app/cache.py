@@ -0,0 +1,100 @@
+"""
+Redis cache connection management and cache-aside helpers.
+
+Caching is optional: when REDIS_URL is not configured no client is set,
+the helpers below become no-ops and every read falls through to Neo4j.
+Redis errors are logged and treated as cache misses so an unavailable
+cache never fails a request.
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import Response
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Global Redis client instance
+_redis_client: Optional[Redis] = None
+
+
+def set_redis_client(client: Redis) -> None:
+    """Set the Redis client instance."""
+    global _redis_client
+    _redis_client = client
+
+
+def get_redis_client() -> Optional[Redis]:
+    """Get the Redis client instance, or None if caching is disabled."""
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close the Redis client if it exists."""
+    global _redis_client
+    if _redis_client:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+def profile_id_key(user_id: str) -> str:
+    """Cache key for a serialized ProfileResponse."""
+    return f"profile:id:{user_id}"
+
+
+def profile_username_key(username: str) -> str:
+    """Cache key mapping a username to its user ID."""
+    return f"profile:username:{username}"
+
+
+def suggestions_key(user_id: str) -> str:
+    """Cache key for a user's serialized follow suggestions."""
+    return f"suggestions:{user_id}"
+
+
+def popular_key(limit: int, cursor: Optional[str]) -> str:
+    """Cache key for one serialized page of popular users."""
+    return f"popular:v1:{limit}:{cursor or ''}"
+
+
+def cached_json_response(cached: str) -> Response:
+    """Serve an already-serialized JSON body without re-validating it."""
+    return Response(content=cached, media_type="application/json")
+
+
+async def cache_get(redis: Optional[Redis], key: str) -> Optional[str]:
+    """Return the cached value for key, or None on a miss."""
+    if redis is None:
+        return None
+    try:
+        return await redis.get(key)
+    except RedisError as e:
+        logger.warning("Redis GET %s failed: %s", key, e)
+        return None
+
+
+async def cache_set(
+    redis: Optional[Redis],
+    key: str,
+    value: str,
+    ttl: int,
+) -> None:
+    """Store value under key for ttl seconds."""
+    if redis is None:
+        return
+    try:
+        await redis.set(key, value, ex=ttl)
+    except RedisError as e:
+        logger.warning("Redis SET %s failed: %s", key, e)
+
+
+async def cache_delete(redis: Optional[Redis], *keys: str) -> None:
+    """Remove keys from the cache."""
+    if redis is None or not keys:
+        return
+    try:
+        await redis.delete(*keys)
+    except RedisError as e:
+        logger.warning("Redis DEL %s failed: %s", " ".join(keys), e)
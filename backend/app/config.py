@@ -3,6 +3,9 @@ Application configuration using pydantic-settings.
 Loads configuration from environment variables.
 """
 
+from typing import Optional
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -14,17 +17,32 @@ class Settings(BaseSettings):
     neo4j_uri: str
     neo4j_username: str
     neo4j_password: str
+    neo4j_database: str = "neo4j"
+    neo4j_pool_size: int = 100  # max pooled connections per process
+    neo4j_acq_timeout: float = 60.0  # seconds to wait for a pooled connection
+    neo4j_max_connection_lifetime: int = 1800  # seconds before a connection is recycled
     
     # Clerk Authentication Configuration
     clerk_secret_key: str
     clerk_frontend_api: str = "clerk.your-domain.com"  # e.g., "clerk.example.com" or from Clerk dashboard
     
+    # Redis Configuration (optional; caching is disabled when unset)
+    redis_url: Optional[str] = None
+    
     # Server Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     
-    # CORS Configuration
-    cors_origins: str = "http://localhost:5173"  # Vite default port
+    # CORS Configuration: comma-separated origins, parsed once into a tuple
+    cors_origins: tuple[str, ...] | str = ("http://localhost:5173",)  # Vite default port
+    
+    @field_validator("cors_origins", mode="after")
+    @classmethod
+    def split_cors_origins(cls, v: tuple[str, ...] | str) -> tuple[str, ...]:
+        """Split a comma-separated origin list into a tuple of origins."""
+        if isinstance(v, str):
+            return tuple(o.strip() for o in v.split(",") if o.strip())
+        return v
     
     class Config:
         env_file = ".env"
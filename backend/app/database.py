@@ -5,12 +5,30 @@ This module manages the Neo4j driver instance to avoid circular imports.
 """
 
 from typing import Optional
-from neo4j import AsyncDriver
+from neo4j import AsyncDriver, AsyncGraphDatabase
+
+from app.config import Settings
 
 # Global Neo4j driver instance
 _neo4j_driver: Optional[AsyncDriver] = None
 
 
+def create_neo4j_driver(settings: Settings) -> AsyncDriver:
+    """
+    Create the Neo4j driver with the configured connection pool.
+    
+    Called once per process; the driver is safe to share between
+    concurrent requests and owns the connection pool.
+    """
+    return AsyncGraphDatabase.driver(
+        settings.neo4j_uri,
+        auth=(settings.neo4j_username, settings.neo4j_password),
+        max_connection_pool_size=settings.neo4j_pool_size,
+        connection_acquisition_timeout=settings.neo4j_acq_timeout,
+        max_connection_lifetime=settings.neo4j_max_connection_lifetime,
+    )
+
+
 def set_neo4j_driver(driver: AsyncDriver) -> None:
     """Set the Neo4j driver instance."""
     global _neo4j_driver
@@ -2,54 +2,86 @@
 Dependency injection for FastAPI routes.
 """
 
-from typing import AsyncGenerator
-from neo4j import AsyncSession
+from dataclasses import dataclass
+from typing import Annotated, Optional
 
+from fastapi import Depends
+from neo4j import AsyncDriver
+from redis.asyncio import Redis
+
+from app.cache import get_redis_client
+from app.config import Settings
 from app.database import get_neo4j_driver
 from app.services.neo4j_service import Neo4jService
 from app.middleware.auth import (
     ClerkUser,
+    get_app_settings,
     get_current_user,
     get_optional_user,
 )
 
 # Re-export auth dependencies for convenience
 __all__ = [
-    "get_db_session",
+    "get_db_driver",
+    "get_redis",
     "get_neo4j_service",
+    "get_ctx",
+    "RequestCtx",
+    "get_app_settings",
     "ClerkUser",
     "get_current_user",
     "get_optional_user",
 ]
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+def get_db_driver() -> AsyncDriver:
     """
-    Dependency that provides a Neo4j session.
-    Automatically closes the session after the request.
+    Dependency that provides the shared Neo4j driver.
+    
+    The driver pools connections itself; open an explicit session from it
+    only when several queries must share one transaction.
     """
     driver = get_neo4j_driver()
     if driver is None:
         raise RuntimeError("Neo4j driver not initialized")
+    return driver
+
+
+def get_redis() -> Optional[Redis]:
+    """
+    Dependency that provides the shared Redis client.
     
-    session = driver.session()
-    try:
-        yield session
-    finally:
-        await session.close()
+    Returns None when caching is not configured; the cache helpers in
+    app.cache treat a None client as a permanent miss.
+    """
+    return get_redis_client()
 
 
-async def get_neo4j_service() -> AsyncGenerator[Neo4jService, None]:
+def get_neo4j_service(
+    settings: Annotated[Settings, Depends(get_app_settings)],
+) -> Neo4jService:
     """
     Dependency that provides a Neo4jService instance.
-    Automatically manages the underlying session lifecycle.
+    Queries borrow pooled driver connections, so there is no per-request
+    session to open or close.
     """
-    driver = get_neo4j_driver()
-    if driver is None:
-        raise RuntimeError("Neo4j driver not initialized")
+    return Neo4jService(get_db_driver(), settings.neo4j_database)
+
+
+@dataclass(frozen=True, slots=True)
+class RequestCtx:
+    """The authenticated user and Neo4j service for a request."""
+    user: ClerkUser
+    service: Neo4jService
+
+
+def get_ctx(
+    user: Annotated[ClerkUser, Depends(get_current_user)],
+    service: Annotated[Neo4jService, Depends(get_neo4j_service)],
+) -> RequestCtx:
+    """
+    Dependency that resolves authentication and the Neo4j service together.
     
-    session = driver.session()
-    try:
-        yield Neo4jService(session)
-    finally:
-        await session.close()
+    Lets authenticated endpoints declare a single dependency.
+    """
+    return RequestCtx(user, service)
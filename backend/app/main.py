@@ -2,33 +2,114 @@
 FastAPI application entry point.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import queue
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager, suppress
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from neo4j import AsyncGraphDatabase
+from fastapi.responses import ORJSONResponse
+import httpx
+from redis.asyncio import Redis
 
+from app.cache import set_redis_client, close_redis_client
 from app.config import get_settings
-from app.database import set_neo4j_driver, close_neo4j_driver
-from app.routers import social_graph
+from app.database import create_neo4j_driver, set_neo4j_driver, close_neo4j_driver
+from app.middleware.auth import configure_jwks, jwks_refresh_loop, refresh_jwks
+from app.routers import feed, onboarding, profile, social_graph
+from app.services.neo4j_service import Neo4jService
 
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _queued_logging() -> Iterator[None]:
+    """
+    Route root logging through a queue for the duration of the block.
+    
+    Handlers (formatting and stream writes) then run on the listener's
+    thread instead of blocking the event loop. On exit, including a failed
+    startup, the listener is drained and the root logger gets its original
+    handlers back, so logging keeps working after shutdown and a later
+    lifespan in the same process starts from the real handlers.
+    """
+    root = logging.getLogger()
+    original_handlers = root.handlers[:]
+    for handler in original_handlers:
+        root.removeHandler(handler)
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    root.addHandler(queue_handler)
+    listener = QueueListener(
+        log_queue,
+        *(original_handlers or [logging.StreamHandler()]),
+        respect_handler_level=True,
+    )
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        root.removeHandler(queue_handler)
+        for handler in original_handlers:
+            root.addHandler(handler)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown."""
-    settings = get_settings()
-    
-    # Initialize Neo4j driver on startup
-    driver = AsyncGraphDatabase.driver(
-        settings.neo4j_uri,
-        auth=(settings.neo4j_username, settings.neo4j_password)
-    )
-    set_neo4j_driver(driver)
-    
-    yield
-    
-    # Close Neo4j driver on shutdown
-    await close_neo4j_driver()
+    with _queued_logging():
+        # Resolve settings once; request handlers read them from app.state
+        settings = get_settings()
+        app.state.settings = settings
+        configure_jwks(settings)
+        
+        # Initialize the process-wide Neo4j driver on startup
+        driver = create_neo4j_driver(settings)
+        set_neo4j_driver(driver)
+        
+        # One-shot schema setup and data migrations
+        service = Neo4jService(driver, settings.neo4j_database)
+        await service.ensure_schema()
+        await service.backfill_user_properties()
+        
+        # Redis cache is optional; without it reads always go to Neo4j
+        if settings.redis_url:
+            set_redis_client(Redis.from_url(settings.redis_url, decode_responses=True))
+        
+        # Shared keep-alive HTTP/2 client for the Clerk Backend API
+        app.state.clerk_client = httpx.AsyncClient(
+            base_url="https://api.clerk.com",
+            headers={
+                "Authorization": f"Bearer {settings.clerk_secret_key}",
+                "Content-Type": "application/json",
+            },
+            http2=True,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        )
+        
+        # Warm the JWKS cache so the first authenticated request does not fetch
+        # it, then keep it fresh in the background
+        try:
+            await refresh_jwks()
+        except Exception:
+            logger.exception("Initial JWKS fetch failed")
+        jwks_task = asyncio.create_task(jwks_refresh_loop())
+        
+        yield
+        
+        jwks_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await jwks_task
+        
+        # Close Clerk client, Redis and Neo4j driver on shutdown
+        await app.state.clerk_client.aclose()
+        await close_redis_client()
+        await close_neo4j_driver()
 
 
 def create_app() -> FastAPI:
@@ -39,26 +120,25 @@ def create_app() -> FastAPI:
         title="Social Media App API",
         description="Backend API for the social media application",
         version="1.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Configure CORS middleware
-    cors_origins = [origin.strip() for origin in settings.cors_origins.split(",")]
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=cors_origins,
+        allow_origins=settings.cors_origins,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
+        allow_headers=["authorization", "content-type"],
+        max_age=86400,  # Let browsers cache preflight responses for a day
     )
     
-    # Import routers here to avoid circular imports
-    from app.routers import onboarding, profile, feed
-    
     # Include routers
     app.include_router(onboarding.router)
     app.include_router(profile.router)
     app.include_router(feed.router)
+    app.include_router(social_graph.router)
     
     # Health check endpoint (Requirements 2.3)
     @app.get("/api/health", tags=["health"])
@@ -79,4 +159,16 @@ def create_app() -> FastAPI:
 app = create_app()
 
 
-app.include_router(social_graph.router)
\ No newline at end of file
+if __name__ == "__main__":
+    import uvicorn
+    
+    # Serve on uvloop + httptools; the Neo4j driver's many small awaits are
+    # cheaper to schedule on libuv than on the default asyncio loop
+    settings = get_settings()
+    uvicorn.run(
+        app,
+        host=settings.api_host,
+        port=settings.api_port,
+        loop="uvloop",
+        http="httptools",
+    )
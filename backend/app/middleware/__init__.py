@@ -6,6 +6,8 @@ from app.middleware.auth import (
     ClerkUser,
     extract_token_from_header,
     verify_clerk_token,
+    get_app_settings,
+    get_clerk_client,
     get_current_user,
     get_optional_user,
 )
@@ -14,6 +16,8 @@ __all__ = [
     "ClerkUser",
     "extract_token_from_header",
     "verify_clerk_token",
+    "get_app_settings",
+    "get_clerk_client",
     "get_current_user",
     "get_optional_user",
 ]
@@ -3,14 +3,22 @@ Clerk token verification middleware.
 Provides authentication dependency for protected routes.
 """
 
+import asyncio
+import hashlib
+import logging
+import threading
+import time
 from typing import Optional
-from fastapi import Header, HTTPException, status
+from cachetools import TTLCache
+from fastapi import Depends, Header, HTTPException, Request, status
 from pydantic import BaseModel
 import httpx
 import jwt
 from jwt import PyJWKClient
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
 
 
 class ClerkUser(BaseModel):
@@ -23,20 +31,126 @@ class ClerkUser(BaseModel):
     public_metadata: Optional[dict] = None
 
 
+# 401 details. A fresh HTTPException is raised per request: re-raising one
+# shared instance would keep growing its __traceback__ across requests.
+_WWW_AUTH = {"WWW-Authenticate": "Bearer"}
+_ERR_MISSING = "Missing or invalid authorization header"
+_ERR_INVALID = "Invalid or expired token"
+_ERR_NO_SUB = "Invalid token: missing user ID"
+_ERR_NO_USER = "User not found"
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    """Build a 401 response carrying the Bearer challenge."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_WWW_AUTH,
+    )
+
 # Cache the JWKS client
 _jwks_client: Optional[PyJWKClient] = None
+_jwks_url: Optional[str] = None
+_jwks_refresh_lock = asyncio.Lock()
+
+# How often the background task re-fetches Clerk's JWKS
+JWKS_REFRESH_INTERVAL_SECONDS = 30 * 60
+
+# Verified token payloads keyed by a hash of the raw token. The TTL is kept
+# short to bound how long a revoked session can keep being accepted.
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+_token_cache_lock = threading.Lock()
+
+# Clerk user details keyed by Clerk user ID, so authenticated requests do not
+# each pay a round-trip to the Clerk Backend API.
+_clerk_user_cache: TTLCache = TTLCache(maxsize=50000, ttl=300)
+
+# Clerk user requests in flight, keyed by user ID. Concurrent cache misses
+# for the same user await one shared request instead of each calling Clerk.
+_clerk_user_inflight: dict[str, asyncio.Task] = {}
+
+
+def configure_jwks(settings: Settings) -> None:
+    """
+    Capture the Clerk JWKS endpoint from settings.
+    
+    Called once at startup so token verification never reads settings.
+    
+    Args:
+        settings: The application settings
+    """
+    global _jwks_url
+    _jwks_url = f"https://{settings.clerk_frontend_api}/.well-known/jwks.json"
+
+
+def _get_jwks_url() -> str:
+    """Return the Clerk JWKS endpoint, configuring it on first use."""
+    if _jwks_url is None:
+        configure_jwks(get_settings())
+    return _jwks_url
+
+
+def _build_jwks_client() -> PyJWKClient:
+    """Create a JWKS client that caches both the JWK Set and signing keys."""
+    return PyJWKClient(
+        _get_jwks_url(),
+        cache_keys=True,
+        max_cached_keys=16,
+        cache_jwk_set=True,
+        lifespan=3600,
+        timeout=5,
+    )
 
 
 def get_jwks_client() -> PyJWKClient:
     """Get or create the JWKS client for Clerk token verification."""
     global _jwks_client
     if _jwks_client is None:
-        settings = get_settings()
-        jwks_url = f"https://{settings.clerk_frontend_api}/.well-known/jwks.json"
-        _jwks_client = PyJWKClient(jwks_url)
+        _jwks_client = _build_jwks_client()
     return _jwks_client
 
 
+async def refresh_jwks() -> None:
+    """
+    Fetch Clerk's JWKS and swap in a JWKS client primed with it.
+    
+    A refresh already in flight is awaited instead of starting a second
+    fetch. Token verification keeps using the previous client until the
+    new one is assigned.
+    
+    Raises:
+        httpx.HTTPError: If the JWKS endpoint cannot be fetched
+        jwt.exceptions.PyJWTError: If the response is not a usable JWK Set
+    """
+    global _jwks_client
+    if _jwks_refresh_lock.locked():
+        async with _jwks_refresh_lock:
+            return
+    
+    async with _jwks_refresh_lock:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(_get_jwks_url())
+            response.raise_for_status()
+        data = response.json()
+        jwt.PyJWKSet.from_dict(data)  # Reject unusable key sets up front
+        
+        jwks_client = _build_jwks_client()
+        jwks_client.jwk_set_cache.put(data)
+        _jwks_client = jwks_client
+
+
+async def jwks_refresh_loop(
+    interval: float = JWKS_REFRESH_INTERVAL_SECONDS,
+) -> None:
+    """Refresh the JWKS periodically so requests never wait on a fetch."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_jwks()
+        except (httpx.HTTPError, jwt.exceptions.PyJWTError, ValueError) as e:
+            logger.warning("JWKS refresh failed: %s", e)
+
+
 def extract_token_from_header(authorization: Optional[str]) -> Optional[str]:
     """
     Extract the Bearer token from the Authorization header.
@@ -47,18 +161,15 @@ def extract_token_from_header(authorization: Optional[str]) -> Optional[str]:
     Returns:
         The token string if valid Bearer format, None otherwise
     """
-    if not authorization:
-        return None
-    
-    parts = authorization.split()
-    if len(parts) != 2:
+    # Prefix check and slice instead of split() to avoid allocating parts
+    if not authorization or len(authorization) < 8:
         return None
     
-    scheme, token = parts
-    if scheme.lower() != "bearer":
+    if authorization[:7].lower() != "bearer ":
         return None
     
-    return token
+    token = authorization[7:].strip()
+    return token or None
 
 
 def verify_clerk_token(token: str) -> Optional[dict]:
@@ -71,6 +182,15 @@ def verify_clerk_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload if valid, None if invalid
     """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached is not None:
+        if cached.get("exp", 0) > time.time():
+            return cached
+        with _token_cache_lock:
+            _token_cache.pop(key, None)
+
     try:
         jwks_client = get_jwks_client()
         signing_key = jwks_client.get_signing_key_from_jwt(token)
@@ -81,121 +201,184 @@ def verify_clerk_token(token: str) -> Optional[dict]:
             algorithms=["RS256"],
             options={"verify_aud": False}  # Clerk doesn't use audience
         )
-        return decoded
     except jwt.exceptions.PyJWTError as e:
-        print(f"JWT verification failed: {e}")
+        with _token_cache_lock:
+            _token_cache.pop(key, None)
+        logger.warning("JWT verification failed: %s", e)
         return None
-    except Exception as e:
-        print(f"Token verification error: {e}")
+    except Exception:
+        logger.exception("Token verification error")
         return None
 
+    # Only cache tokens that carry an expiry so the hit path can honour it
+    if "exp" in decoded:
+        with _token_cache_lock:
+            _token_cache[key] = decoded
+    return decoded
+
+
+def invalidate_clerk_user(user_id: str) -> None:
+    """
+    Drop a cached Clerk user so the next request re-fetches it.
+    
+    Call this after changing the user in Clerk (e.g. updating metadata).
+    
+    Args:
+        user_id: The Clerk user ID
+    """
+    _clerk_user_cache.pop(user_id, None)
+
+
+def get_clerk_client(request: Request) -> httpx.AsyncClient:
+    """
+    FastAPI dependency that returns the shared Clerk Backend API client.
+    
+    The client carries the Clerk base URL and auth headers, so callers only
+    pass the request path.
+    """
+    return request.app.state.clerk_client
+
 
-async def fetch_clerk_user(user_id: str) -> Optional[ClerkUser]:
+def get_app_settings(request: Request) -> Settings:
+    """FastAPI dependency that returns the settings resolved at startup."""
+    return request.app.state.settings
+
+
+async def fetch_clerk_user(
+    user_id: str,
+    client: httpx.AsyncClient,
+) -> Optional[ClerkUser]:
     """
     Fetch user details from Clerk Backend API.
     
+    Results are cached per user ID for a few minutes; lookups that fail
+    are not cached. Concurrent misses for the same user share one request.
+    
     Args:
         user_id: The Clerk user ID
+        client: Shared HTTP client for the Clerk Backend API
         
     Returns:
         ClerkUser if found, None otherwise
     """
-    settings = get_settings()
+    user = _clerk_user_cache.get(user_id)
+    if user is not None:
+        return user
     
-    url = f"https://api.clerk.com/v1/users/{user_id}"
-    headers = {
-        "Authorization": f"Bearer {settings.clerk_secret_key}",
-        "Content-Type": "application/json",
-    }
+    task = _clerk_user_inflight.get(user_id)
+    if task is None:
+        task = asyncio.create_task(_load_clerk_user(user_id, client))
+        _clerk_user_inflight[user_id] = task
+        task.add_done_callback(lambda _: _clerk_user_inflight.pop(user_id, None))
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers)
+    # Shield so one cancelled waiter does not cancel the shared request
+    return await asyncio.shield(task)
+
+
+async def _load_clerk_user(
+    user_id: str,
+    client: httpx.AsyncClient,
+) -> Optional[ClerkUser]:
+    """Request a Clerk user and cache it if found."""
+    user = await _request_clerk_user(user_id, client)
+    if user is not None:
+        _clerk_user_cache[user_id] = user
+    return user
+
+
+async def _request_clerk_user(
+    user_id: str,
+    client: httpx.AsyncClient,
+) -> Optional[ClerkUser]:
+    """Request user details from the Clerk Backend API, bypassing the cache."""
+    try:
+        response = await client.get(f"/v1/users/{user_id}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            
+            # Get primary email
+            email = None
+            email_addresses = data.get("email_addresses", [])
+            primary_email_id = data.get("primary_email_address_id")
+            for email_obj in email_addresses:
+                if email_obj.get("id") == primary_email_id:
+                    email = email_obj.get("email_address")
+                    break
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Get primary email
-                email = None
-                email_addresses = data.get("email_addresses", [])
-                primary_email_id = data.get("primary_email_address_id")
-                for email_obj in email_addresses:
-                    if email_obj.get("id") == primary_email_id:
-                        email = email_obj.get("email_address")
-                        break
-                
-                return ClerkUser(
-                    id=data.get("id", ""),
-                    email=email,
-                    first_name=data.get("first_name"),
-                    last_name=data.get("last_name"),
-                    image_url=data.get("image_url"),
-                    public_metadata=data.get("public_metadata"),
-                )
-            return None
-        except httpx.RequestError as e:
-            print(f"Failed to fetch Clerk user: {e}")
-            return None
+            return ClerkUser(
+                id=data.get("id", ""),
+                email=email,
+                first_name=data.get("first_name"),
+                last_name=data.get("last_name"),
+                image_url=data.get("image_url"),
+                public_metadata=data.get("public_metadata"),
+            )
+        return None
+    except httpx.RequestError as e:
+        logger.warning("Failed to fetch Clerk user: %s", e)
+        return None
 
 
-async def get_current_user(
-    authorization: Optional[str] = Header(default=None)
-) -> ClerkUser:
+async def _resolve_user(token: str, clerk_client: httpx.AsyncClient) -> ClerkUser:
     """
-    FastAPI dependency that validates the Clerk token and returns the current user.
+    Resolve a bearer token to its Clerk user.
+    
+    Both steps are cached: verify_clerk_token by token digest (so repeat
+    requests skip the RS256 check until the token expires) and
+    fetch_clerk_user by user ID.
     
-    Args:
-        authorization: The Authorization header value
-        
-    Returns:
-        ClerkUser with authenticated user information
-        
     Raises:
-        HTTPException: 401 if token is missing or invalid
+        HTTPException: 401 if the token is invalid or the user is unknown
     """
-    token = extract_token_from_header(authorization)
-    
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid authorization header",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
     # Verify the JWT token
     payload = verify_clerk_token(token)
     
     if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized(_ERR_INVALID)
     
     # Extract user ID from the 'sub' claim
     user_id = payload.get("sub")
     if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token: missing user ID",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized(_ERR_NO_SUB)
     
     # Fetch full user details from Clerk
-    user = await fetch_clerk_user(user_id)
+    user = await fetch_clerk_user(user_id, clerk_client)
     
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized(_ERR_NO_USER)
     
     return user
 
 
+async def get_current_user(
+    authorization: Optional[str] = Header(default=None),
+    clerk_client: httpx.AsyncClient = Depends(get_clerk_client),
+) -> ClerkUser:
+    """
+    FastAPI dependency that validates the Clerk token and returns the current user.
+    
+    Args:
+        authorization: The Authorization header value
+        clerk_client: Shared HTTP client for the Clerk Backend API
+        
+    Returns:
+        ClerkUser with authenticated user information
+        
+    Raises:
+        HTTPException: 401 if token is missing or invalid
+    """
+    token = extract_token_from_header(authorization)
+    
+    if not token:
+        raise _unauthorized(_ERR_MISSING)
+    
+    return await _resolve_user(token, clerk_client)
+
+
 async def get_optional_user(
-    authorization: Optional[str] = Header(default=None)
+    authorization: Optional[str] = Header(default=None),
+    clerk_client: httpx.AsyncClient = Depends(get_clerk_client),
 ) -> Optional[ClerkUser]:
     """
     FastAPI dependency that optionally validates the Clerk token.
@@ -203,6 +386,7 @@ async def get_optional_user(
     
     Args:
         authorization: The Authorization header value
+        clerk_client: Shared HTTP client for the Clerk Backend API
         
     Returns:
         ClerkUser if valid token provided, None if no token
@@ -215,30 +399,4 @@ async def get_optional_user(
     if not token:
         return None
     
-    payload = verify_clerk_token(token)
-    
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token: missing user ID",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user = await fetch_clerk_user(user_id)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    return user
+    return await _resolve_user(token, clerk_client)
@@ -5,11 +5,24 @@ This module exports all Pydantic models used for request/response validation.
 """
 
 from .responses import ErrorResponse
-from .user import OnboardingRequest, OnboardingResponse, ProfileResponse
+from .social import BulkFollowRequest, BulkFollowResponse
+from .user import (
+    OnboardingRequest,
+    OnboardingResponse,
+    ProfileBundleResponse,
+    ProfileResponse,
+    UserPage,
+    UserProfile,
+)
 
 __all__ = [
     "OnboardingRequest",
     "OnboardingResponse",
     "ProfileResponse",
+    "ProfileBundleResponse",
+    "UserProfile",
+    "UserPage",
     "ErrorResponse",
+    "BulkFollowRequest",
+    "BulkFollowResponse",
 ]
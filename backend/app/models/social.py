@@ -0,0 +1,37 @@
+"""
+Social graph request and response models.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class BulkFollowRequest(BaseModel):
+    """
+    Request model for following several users at once.
+    
+    Used by onboarding, import and "follow all suggestions" flows.
+    """
+    target_ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="IDs of the users to follow"
+    )
+
+
+class BulkFollowResponse(BaseModel):
+    """
+    Response model for a bulk follow.
+    
+    followed lists the targets that exist and are now followed, including
+    ones that were already followed; unknown IDs and the caller's own ID
+    are left out.
+    """
+    success: bool = Field(
+        ...,
+        description="Whether the request was processed"
+    )
+    followed: list[str] = Field(
+        default_factory=list,
+        description="IDs of the users now followed"
+    )
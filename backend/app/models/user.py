@@ -11,20 +11,22 @@ from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
 
-VALID_AVATAR_IDS = [f"avatar_{i}" for i in range(1, 11)]
+_AVATAR_IDS = tuple(f"avatar_{i}" for i in range(1, 11))
+VALID_AVATAR_IDS = frozenset(_AVATAR_IDS)
+_AVATAR_CHOICES = ", ".join(_AVATAR_IDS)
 
+_USERNAME_RE = re.compile(r"\A[a-zA-Z0-9_]+\Z")
 
-class OnboardingRequest(BaseModel):
+
+class _ProfileFields(BaseModel):
     """
-    Request model for user onboarding.
+    Editable profile fields shared by onboarding and profile updates.
     
     Validates:
     - name: 1-50 characters (trimmed)
     - username: 3-20 characters, alphanumeric + underscore only
     - bio: max 160 characters (optional)
     - avatar: must be one of avatar_1 through avatar_10
-    
-    Requirements: 4.2, 4.3, 4.4, 2.1, 2.2
     """
     name: str = Field(
         ...,
@@ -62,7 +64,7 @@ class OnboardingRequest(BaseModel):
             raise ValueError("Username must be at least 3 characters")
         if len(v) > 20:
             raise ValueError("Username must be at most 20 characters")
-        if not re.match(r"^[a-zA-Z0-9_]+$", v):
+        if not _USERNAME_RE.match(v):
             raise ValueError(
                 "Username can only contain letters, numbers, and underscores"
             )
@@ -81,12 +83,18 @@ class OnboardingRequest(BaseModel):
     def validate_avatar(cls, v: str) -> str:
         """Validate avatar is one of the 10 valid avatar IDs."""
         if v not in VALID_AVATAR_IDS:
-            raise ValueError(
-                f"Avatar must be one of: {', '.join(VALID_AVATAR_IDS)}"
-            )
+            raise ValueError(f"Avatar must be one of: {_AVATAR_CHOICES}")
         return v
 
 
+class OnboardingRequest(_ProfileFields):
+    """
+    Request model for user onboarding.
+    
+    Requirements: 4.2, 4.3, 4.4, 2.1, 2.2
+    """
+
+
 class ProfileResponse(BaseModel):
     """
     Response model for user profile data.
@@ -126,6 +134,44 @@ class ProfileResponse(BaseModel):
     )
 
 
+class UserProfile(BaseModel):
+    """User profile data model for Neo4j operations.
+    Schema: bio, email, id, name, username, avatar, followers_count, following_count
+    
+    Instances built from query results use model_construct: the data is
+    trusted, so per-row validation is skipped.
+    """
+    id: str
+    name: str
+    username: str
+    email: str
+    bio: str = ""
+    avatar: str = "avatar_1"
+    followers_count: int = 0
+    following_count: int = 0
+
+
+class UserPage(BaseModel):
+    """One page of a user listing.
+    
+    next_cursor is an opaque token for the following page, or None when
+    this page is the last one.
+    """
+    items: list[UserProfile]
+    next_cursor: Optional[str] = None
+
+
+class ProfileBundleResponse(ProfileResponse):
+    """
+    Response model for the profile page: the profile, its counts and the
+    first page of followers.
+    """
+    followers: UserPage = Field(
+        ...,
+        description="First page of followers; next_cursor continues at /api/social/followers/{user_id}"
+    )
+
+
 class OnboardingResponse(BaseModel):
     """
     Response model for successful onboarding.
@@ -140,74 +186,9 @@ class OnboardingResponse(BaseModel):
     )
 
 
-class ProfileUpdateRequest(BaseModel):
+class ProfileUpdateRequest(_ProfileFields):
     """
     Request model for updating user profile.
     
-    Validates:
-    - name: 1-50 characters (trimmed)
-    - username: 3-20 characters, alphanumeric + underscore only
-    - bio: max 160 characters (optional)
-    - avatar: must be one of avatar_1 through avatar_10
-    
     Requirements: 2.1, 3.1, 4.1, 5.3
     """
-    name: str = Field(
-        ...,
-        description="User's name (1-50 characters)"
-    )
-    username: str = Field(
-        ...,
-        description="Unique username (3-20 characters, alphanumeric + underscore)"
-    )
-    bio: str = Field(
-        default="",
-        description="User bio (max 160 characters)"
-    )
-    avatar: str = Field(
-        ...,
-        description="Avatar identifier (avatar_1 through avatar_10)"
-    )
-
-    @field_validator("name")
-    @classmethod
-    def validate_name(cls, v: str) -> str:
-        """Validate name is 1-50 characters after trimming."""
-        trimmed = v.strip()
-        if len(trimmed) < 1:
-            raise ValueError("Name must be at least 1 character")
-        if len(trimmed) > 50:
-            raise ValueError("Name must be at most 50 characters")
-        return trimmed
-
-    @field_validator("username")
-    @classmethod
-    def validate_username(cls, v: str) -> str:
-        """Validate username is 3-20 chars, alphanumeric + underscore only."""
-        if len(v) < 3:
-            raise ValueError("Username must be at least 3 characters")
-        if len(v) > 20:
-            raise ValueError("Username must be at most 20 characters")
-        if not re.match(r"^[a-zA-Z0-9_]+$", v):
-            raise ValueError(
-                "Username can only contain letters, numbers, and underscores"
-            )
-        return v
-
-    @field_validator("bio")
-    @classmethod
-    def validate_bio(cls, v: str) -> str:
-        """Validate bio is at most 160 characters."""
-        if len(v) > 160:
-            raise ValueError("Bio must be at most 160 characters")
-        return v
-
-    @field_validator("avatar")
-    @classmethod
-    def validate_avatar(cls, v: str) -> str:
-        """Validate avatar is one of the 10 valid avatar IDs."""
-        if v not in VALID_AVATAR_IDS:
-            raise ValueError(
-                f"Avatar must be one of: {', '.join(VALID_AVATAR_IDS)}"
-            )
-        return v
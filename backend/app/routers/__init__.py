@@ -1,4 +1,5 @@
 # API Routers
-# Note: Import routers directly in main.py to avoid circular imports
+# Routers depend on app.dependencies, never on app.main, so main.py can
+# import them at module level.
 
-__all__ = ["onboarding", "profile"]
+__all__ = ["feed", "onboarding", "profile", "social_graph"]
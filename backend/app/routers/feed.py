@@ -6,34 +6,40 @@ Handles retrieval of posts from followed users for the home feed.
 
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from app.dependencies import get_neo4j_service, get_current_user, ClerkUser
+from app.dependencies import RequestCtx, get_ctx
 from app.models.responses import ErrorResponse
-from app.services.neo4j_service import Neo4jService, FeedPost
+from app.services.neo4j_service import FeedPost
 
 
-class FeedResponse(BaseModel):
-    """Response model for the feed endpoint."""
+class FeedResponse(msgspec.Struct, frozen=True, gc=False):
+    """Response body for the feed endpoint."""
     posts: List[FeedPost]
 
 
+_feed_encoder = msgspec.json.Encoder()
+
+
 router = APIRouter(prefix="/api", tags=["feed"])
 
 
 @router.get(
     "/feed",
-    response_model=FeedResponse,
+    response_class=Response,
     responses={
+        200: {
+            "description": "Posts from followed users, newest first",
+            "content": {"application/json": {}},
+        },
         401: {"model": ErrorResponse, "description": "Not authenticated"},
         500: {"model": ErrorResponse, "description": "Server error"},
     },
 )
 async def get_feed(
-    current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j_service: Annotated[Neo4jService, Depends(get_neo4j_service)],
-) -> FeedResponse:
+    ctx: Annotated[RequestCtx, Depends(get_ctx)],
+) -> Response:
     """
     Get posts from users the current user follows.
     
@@ -41,16 +47,22 @@ async def get_feed(
     Returns an empty array if the user doesn't follow anyone
     or if followed users have no posts.
     
+    The body is encoded with msgspec directly, skipping response model
+    validation for data the service already shaped.
+    
     Requirements: 2.1, 2.2
     """
     try:
-        posts = await neo4j_service.get_feed_posts(current_user.id)
+        posts = await ctx.service.get_feed_posts(ctx.user.id)
     except Exception as e:
         import logging
-        logging.exception(f"Failed to retrieve feed for user {current_user.id}: {e}")
+        logging.exception(f"Failed to retrieve feed for user {ctx.user.id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve feed"
         )
     
-    return FeedResponse(posts=posts)
+    return Response(
+        content=_feed_encoder.encode(FeedResponse(posts=posts)),
+        media_type="application/json",
+    )
@@ -4,13 +4,24 @@ Profile API endpoint.
 Handles user profile retrieval and updates.
 """
 
+import asyncio
 import logging
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from neo4j.exceptions import ConstraintError
+from redis.asyncio import Redis
 
-from app.dependencies import get_neo4j_service, get_current_user, ClerkUser
-from app.models.user import ProfileResponse, ProfileUpdateRequest
+from app.cache import (
+    cache_delete,
+    cache_get,
+    cache_set,
+    cached_json_response,
+    profile_id_key,
+    profile_username_key,
+)
+from app.dependencies import get_neo4j_service, get_current_user, get_redis, ClerkUser
+from app.models.user import ProfileBundleResponse, ProfileResponse, ProfileUpdateRequest
 from app.models.responses import ErrorResponse
 from app.services.neo4j_service import Neo4jService
 
@@ -19,6 +30,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["profile"])
 
+# Profiles are cached briefly; writes that change a profile or its follow
+# counts delete the affected keys, the TTL bounds staleness otherwise
+PROFILE_CACHE_TTL_SECONDS = 60
+
 
 @router.get(
     "/profile/by-username/{username}",
@@ -31,15 +46,24 @@ router = APIRouter(prefix="/api", tags=["profile"])
 async def get_profile_by_username(
     username: str,
     neo4j_service: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)],
 ) -> ProfileResponse:
     """
     Get a user profile by username.
     
-    Queries Neo4j for the user profile and returns it if found.
-    Includes real follower and following counts from the graph.
+    Served from the Redis cache when possible: the username key points at
+    the user ID whose key holds the serialized profile. On a miss, queries
+    Neo4j for the user profile and its real follower and following counts
+    in a single round-trip and populates both keys.
     """
+    cached_id = await cache_get(redis, profile_username_key(username))
+    if cached_id is not None:
+        cached = await cache_get(redis, profile_id_key(cached_id))
+        if cached is not None:
+            return cached_json_response(cached)
+    
     try:
-        profile = await neo4j_service.get_user_by_username(username)
+        result = await neo4j_service.get_user_with_follow_counts_by_username(username)
     except Exception as e:
         logger.exception(f"Failed to retrieve profile for username={username}: {e}")
         raise HTTPException(
@@ -47,20 +71,14 @@ async def get_profile_by_username(
             detail="Failed to retrieve profile"
         )
     
-    if profile is None:
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
     
-    # Get follower and following counts from the graph
-    try:
-        followers_count, following_count = await neo4j_service.get_follow_counts(profile.id)
-    except Exception as e:
-        logger.exception(f"Failed to retrieve follow counts for user_id={profile.id}: {e}")
-        followers_count, following_count = 0, 0
-    
-    return ProfileResponse(
+    profile, followers_count, following_count = result
+    response = ProfileResponse(
         id=profile.id,
         name=profile.name,
         username=profile.username,
@@ -70,6 +88,19 @@ async def get_profile_by_username(
         followers_count=followers_count,
         following_count=following_count
     )
+    await cache_set(
+        redis,
+        profile_id_key(profile.id),
+        response.model_dump_json(),
+        PROFILE_CACHE_TTL_SECONDS,
+    )
+    await cache_set(
+        redis,
+        profile_username_key(profile.username),
+        profile.id,
+        PROFILE_CACHE_TTL_SECONDS,
+    )
+    return response
 
 
 @router.get(
@@ -83,15 +114,21 @@ async def get_profile_by_username(
 async def get_profile(
     user_id: str,
     neo4j_service: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)],
 ) -> ProfileResponse:
     """
     Get a user profile by user ID.
     
-    Queries Neo4j for the user profile and returns it if found.
-    Includes real follower and following counts from the graph.
+    Served from the Redis cache when possible. On a miss, queries Neo4j
+    for the user profile and its real follower and following counts in a
+    single round-trip and caches the result.
     """
+    cached = await cache_get(redis, profile_id_key(user_id))
+    if cached is not None:
+        return cached_json_response(cached)
+    
     try:
-        profile = await neo4j_service.get_user_by_id(user_id)
+        result = await neo4j_service.get_user_with_follow_counts(user_id)
     except Exception as e:
         logger.exception(f"Failed to retrieve profile for user_id={user_id}: {e}")
         raise HTTPException(
@@ -99,20 +136,68 @@ async def get_profile(
             detail="Failed to retrieve profile"
         )
     
-    if profile is None:
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
     
-    # Get follower and following counts from the graph
+    profile, followers_count, following_count = result
+    response = ProfileResponse(
+        id=profile.id,
+        name=profile.name,
+        username=profile.username,
+        email=profile.email,
+        bio=profile.bio,
+        avatar=profile.avatar,
+        followers_count=followers_count,
+        following_count=following_count
+    )
+    await cache_set(
+        redis,
+        profile_id_key(user_id),
+        response.model_dump_json(),
+        PROFILE_CACHE_TTL_SECONDS,
+    )
+    return response
+
+
+@router.get(
+    "/profile/{user_id}/bundle",
+    response_model=ProfileBundleResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Profile not found"},
+        500: {"model": ErrorResponse, "description": "Server error"},
+    },
+)
+async def get_profile_bundle(
+    user_id: str,
+    neo4j_service: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    followers_limit: Annotated[int, Query(ge=1, le=100)] = 10,
+) -> ProfileBundleResponse:
+    """
+    Get a user profile, its follow counts and the first page of followers.
+    
+    Everything the profile page renders comes back from a single Neo4j
+    round-trip instead of separate profile and followers requests.
+    """
     try:
-        followers_count, following_count = await neo4j_service.get_follow_counts(user_id)
+        result = await neo4j_service.get_profile_bundle(user_id, followers_limit)
     except Exception as e:
-        logger.exception(f"Failed to retrieve follow counts for user_id={user_id}: {e}")
-        followers_count, following_count = 0, 0
+        logger.exception(f"Failed to retrieve profile bundle for user_id={user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve profile"
+        )
     
-    return ProfileResponse(
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    profile, followers_count, following_count, followers = result
+    return ProfileBundleResponse(
         id=profile.id,
         name=profile.name,
         username=profile.username,
@@ -120,7 +205,8 @@ async def get_profile(
         bio=profile.bio,
         avatar=profile.avatar,
         followers_count=followers_count,
-        following_count=following_count
+        following_count=following_count,
+        followers=followers
     )
 
 
@@ -141,6 +227,7 @@ async def update_profile(
     request: ProfileUpdateRequest,
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
     neo4j_service: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)],
 ) -> ProfileResponse:
     """
     Update a user's profile.
@@ -157,10 +244,15 @@ async def update_profile(
             detail="Cannot edit another user's profile"
         )
     
-    # Get current profile to check if username changed
-    try:
-        current_profile = await neo4j_service.get_user_by_id(user_id)
-    except Exception:
+    # Fetch the current profile and check the requested username
+    # concurrently; the two lookups are independent round-trips
+    current_profile, is_available = await asyncio.gather(
+        neo4j_service.get_user_by_id(user_id),
+        neo4j_service.is_username_available_for_user(request.username, user_id),
+        return_exceptions=True,
+    )
+    
+    if isinstance(current_profile, Exception):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve profile"
@@ -172,24 +264,19 @@ async def update_profile(
             detail="Profile not found"
         )
     
-    # Check username uniqueness only if username changed (case-insensitive)
-    if request.username.lower() != current_profile.username.lower():
-        try:
-            is_available = await neo4j_service.is_username_available_for_user(
-                request.username,
-                user_id
-            )
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to check username availability"
-            )
-        
-        if not is_available:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Username is already taken"
-            )
+    # The service check is case-insensitive and ignores this user's own
+    # username, so keeping (or re-casing) the current name always passes
+    if isinstance(is_available, Exception):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to check username availability"
+        )
+    
+    if not is_available:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Username is already taken"
+        )
     
     # Update the profile
     try:
@@ -205,12 +292,26 @@ async def update_profile(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except ConstraintError:
+        # Lost a race with another user claiming the same username
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Username is already taken"
+        )
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update profile"
         )
     
+    # Drop the cached profile and both the old and new username pointers
+    await cache_delete(
+        redis,
+        profile_id_key(user_id),
+        profile_username_key(current_profile.username),
+        profile_username_key(updated_profile.username),
+    )
+    
     return ProfileResponse(
         id=updated_profile.id,
         name=updated_profile.name,
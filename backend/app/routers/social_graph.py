@@ -1,122 +1,255 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Annotated
-
-from app.dependencies import get_current_user, ClerkUser, get_neo4j_service
-from app.services.neo4j_service import Neo4jService, UserProfile
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, AsyncIterator, Literal, Optional
+
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+
+from app.cache import (
+    cache_delete,
+    cache_get,
+    cache_set,
+    cached_json_response,
+    popular_key,
+    profile_id_key,
+    suggestions_key,
+)
+from app.dependencies import get_current_user, ClerkUser, get_neo4j_service, get_redis
+from app.models.social import BulkFollowRequest, BulkFollowResponse
+from app.models.user import UserPage, UserProfile
+from app.services.neo4j_service import Neo4jService
 
 router = APIRouter(prefix="/api/social", tags=["social"])
 
+# Shared pagination parameters for the list endpoints
+PageLimit = Annotated[int, Query(ge=1, le=100)]
+PageCursor = Annotated[Optional[str], Query()]
+
+# format=ndjson streams the complete listing (limit and cursor are
+# ignored) one JSON object per line instead of returning a page
+ListFormat = Annotated[Literal["json", "ndjson"], Query(alias="format")]
+
+
+def _ndjson_response(users: AsyncIterator[UserProfile]) -> StreamingResponse:
+    """Stream users as newline-delimited JSON as pages arrive from Neo4j."""
+    async def lines():
+        async for user in users:
+            yield user.model_dump_json().encode() + b"\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Expensive aggregations that change slowly are cached briefly in Redis
+SUGGESTIONS_CACHE_TTL_SECONDS = 300
+POPULAR_CACHE_TTL_SECONDS = 60
+
+_user_list_adapter = TypeAdapter(list[UserProfile])
+
 # -------------------- UC-5 Follow User --------------------
 @router.post("/follow/{target_id}")
 async def follow_user(
     target_id: str,
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)]
 ):
     if target_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
 
     await neo4j.follow_user(current_user.id, target_id)
+    # Both cached profiles now carry stale follow counts, and the
+    # follower's suggestions may still list the target
+    await cache_delete(
+        redis,
+        profile_id_key(current_user.id),
+        profile_id_key(target_id),
+        suggestions_key(current_user.id),
+    )
     return {"success": True, "message": "User followed successfully"}
 
+@router.post("/follow", response_model=BulkFollowResponse)
+async def follow_users_bulk(
+    request: BulkFollowRequest,
+    current_user: Annotated[ClerkUser, Depends(get_current_user)],
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)]
+) -> BulkFollowResponse:
+    """Follow several users in a single round-trip."""
+    followed = await neo4j.follow_users_bulk(current_user.id, request.target_ids)
+    await cache_delete(
+        redis,
+        profile_id_key(current_user.id),
+        suggestions_key(current_user.id),
+        *(profile_id_key(target_id) for target_id in followed),
+    )
+    return BulkFollowResponse(success=True, followed=followed)
+
 # -------------------- UC-6 Unfollow User --------------------
 @router.delete("/unfollow/{target_id}")
 async def unfollow_user(
     target_id: str,
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)]
 ):
-    await neo4j.unfollow_user(current_user.id, target_id)
+    # Unfollowing someone not followed is a no-op, so nothing cached changed
+    if await neo4j.unfollow_user(current_user.id, target_id):
+        await cache_delete(
+            redis,
+            profile_id_key(current_user.id),
+            profile_id_key(target_id),
+            suggestions_key(current_user.id),
+        )
     return {"success": True, "message": "User unfollowed successfully"}
 
 # -------------------- UC-7 Following List --------------------
-@router.get("/following")
+@router.get("/following", response_model=UserPage)
 async def get_following(
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-) -> list[UserProfile]:
-    return await neo4j.get_following(current_user.id)
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    limit: PageLimit = 50,
+    cursor: PageCursor = None,
+    response_format: ListFormat = "json"
+) -> UserPage:
+    if response_format == "ndjson":
+        return _ndjson_response(neo4j.iter_following(current_user.id))
+    return await neo4j.get_following(current_user.id, limit, cursor)
 
 
-@router.get("/following/{user_id}")
+@router.get("/following/{user_id}", response_model=UserPage)
 async def get_following_for_user(
     user_id: str,
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-) -> list[UserProfile]:
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    limit: PageLimit = 50,
+    cursor: PageCursor = None,
+    response_format: ListFormat = "json"
+) -> UserPage:
     """Get the list of users that a specific user is following."""
-    return await neo4j.get_following(user_id)
+    if response_format == "ndjson":
+        return _ndjson_response(neo4j.iter_following(user_id))
+    return await neo4j.get_following(user_id, limit, cursor)
 
 # -------------------- UC-7 Followers List --------------------
-@router.get("/followers")
+@router.get("/followers", response_model=UserPage)
 async def get_followers(
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-) -> list[UserProfile]:
-    return await neo4j.get_followers(current_user.id)
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    limit: PageLimit = 50,
+    cursor: PageCursor = None,
+    response_format: ListFormat = "json"
+) -> UserPage:
+    if response_format == "ndjson":
+        return _ndjson_response(neo4j.iter_followers(current_user.id))
+    return await neo4j.get_followers(current_user.id, limit, cursor)
 
 
-@router.get("/followers/{user_id}")
+@router.get("/followers/{user_id}", response_model=UserPage)
 async def get_followers_for_user(
     user_id: str,
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-) -> list[UserProfile]:
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    limit: PageLimit = 50,
+    cursor: PageCursor = None,
+    response_format: ListFormat = "json"
+) -> UserPage:
     """Get the list of users who follow a specific user."""
-    return await neo4j.get_followers(user_id)
+    if response_format == "ndjson":
+        return _ndjson_response(neo4j.iter_followers(user_id))
+    return await neo4j.get_followers(user_id, limit, cursor)
 
 # -------------------- UC-8 Mutual Connections --------------------
-@router.get("/mutual/{other_id}")
+@router.get(
+    "/mutual/{other_id}",
+    response_model=list[UserProfile],
+    response_model_exclude_none=True,
+)
 async def mutual_connections(
     other_id: str,
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-):
-    return await neo4j.get_mutual_connections(current_user.id, other_id)
-
-@router.get("/mutual/{other_id}")
-async def mutual_connections(
-    other_id: str,
-    current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-):
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    limit: PageLimit = 50
+) -> list[UserProfile]:
     """
     UC-8: Get mutual connections between the current user and another user.
     """
-    return await neo4j.get_mutual_connections(current_user.id, other_id)
+    return await neo4j.get_mutual_connections(current_user.id, other_id, limit)
 
 
-@router.get("/users")
+@router.get("/users", response_model=UserPage)
 async def list_users(
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-):
-    return await neo4j.get_all_users_except(current_user.id)
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    limit: PageLimit = 50,
+    cursor: PageCursor = None,
+    response_format: ListFormat = "json"
+) -> UserPage:
+    if response_format == "ndjson":
+        return _ndjson_response(neo4j.iter_all_users_except(current_user.id))
+    return await neo4j.get_all_users_except(current_user.id, limit, cursor)
 
 # -------------------- UC-9 Suggested Users --------------------
-@router.get("/suggestions")
+@router.get(
+    "/suggestions",
+    response_model=list[UserProfile],
+    response_model_exclude_none=True,
+)
 async def get_suggested_users(
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)]
 ) -> list[UserProfile]:
     """Get new people for user follow based on common connections."""
-    return await neo4j.get_following_suggestions(current_user.id)
+    key = suggestions_key(current_user.id)
+    cached = await cache_get(redis, key)
+    if cached is not None:
+        return cached_json_response(cached)
+    
+    suggestions = await neo4j.get_following_suggestions(current_user.id)
+    await cache_set(
+        redis,
+        key,
+        _user_list_adapter.dump_json(suggestions).decode(),
+        SUGGESTIONS_CACHE_TTL_SECONDS,
+    )
+    return suggestions
 
 # -------------------- UC-10 Search Users --------------------
-@router.get("/users/search")
+@router.get(
+    "/users/search",
+    response_model=list[UserProfile],
+    response_model_exclude_none=True,
+)
 async def search_users(
     q: str,
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    limit: PageLimit = 20,
+    skip: Annotated[int, Query(ge=0)] = 0
 ) -> list[UserProfile]:
-    """Search for users by username or name."""
-    if not q or not q.strip():
+    """Search for users whose username or name starts with q."""
+    # Normalized once here; the service compares against lower-cased values
+    term = q.strip().lower()
+    if not term:
         return []
-    return await neo4j.search_users(q.strip(), current_user.id)
+    return await neo4j.search_users(term, current_user.id, skip=skip, limit=limit)
 
 # -------------------- UC-11 Explore Popular Users --------------------
-@router.get("/popular")
+@router.get("/popular", response_model=UserPage)
 async def explore_popular_users(
     current_user: Annotated[ClerkUser, Depends(get_current_user)],
-    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)]
-) -> list[UserProfile]:
+    neo4j: Annotated[Neo4jService, Depends(get_neo4j_service)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)],
+    limit: PageLimit = 10,
+    cursor: PageCursor = None
+) -> UserPage:
     """Get popular users based on follower count."""
-    return await neo4j.explore_popular_users()
\ No newline at end of file
+    key = popular_key(limit, cursor)
+    cached = await cache_get(redis, key)
+    if cached is not None:
+        return cached_json_response(cached)
+    
+    try:
+        page = await neo4j.explore_popular_users(limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Shared by all users; the TTL alone bounds staleness
+    await cache_set(redis, key, page.model_dump_json(), POPULAR_CACHE_TTL_SECONDS)
+    return page
\ No newline at end of file
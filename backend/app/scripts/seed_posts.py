@@ -5,47 +5,102 @@ This script picks random users and creates sample posts for them in bulk.
 """
 
 import asyncio
-
-from neo4j import AsyncGraphDatabase
+from uuid import uuid4
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from app.config import get_settings
+from app.database import create_neo4j_driver, get_neo4j_driver
+from app.services.neo4j_service import Neo4jService
+
+
+# Sample each user with probability limit * OVERSAMPLE / total so the
+# single-pass filter almost always yields at least ``limit`` candidates
+# while still reaching most of the node store before LIMIT cuts it off
+OVERSAMPLE = 2
+
+# Rows per write transaction
+BATCH_SIZE = 1000
+
+CREATE_POSTS_QUERY = """
+UNWIND $rows AS row
+MATCH (u:User {id: row.uid})
+CREATE (u)-[:POSTED]->(:Post {
+    id: row.pid,
+    content: row.content,
+    createdAt: datetime()
+})
+RETURN count(*) AS created
+"""
+
+
+async def _create_posts(tx, rows: list[dict]) -> int:
+    """Transaction function creating one batch of posts."""
+    result = await tx.run(CREATE_POSTS_QUERY, rows=rows)
+    record = await result.single()
+    return record["created"]
 
 
 async def seed_posts(limit: int = 550):
-    """Create posts for random users in a single bulk query."""
+    """Create posts for random users with batched UNWIND writes."""
     settings = get_settings()
     
-    driver = AsyncGraphDatabase.driver(
-        settings.neo4j_uri,
-        auth=(settings.neo4j_username, settings.neo4j_password)
-    )
+    # Reuse the application's driver when one is running in this process
+    driver = get_neo4j_driver()
+    owns_driver = driver is None
+    if owns_driver:
+        driver = create_neo4j_driver(settings)
     
     try:
-        async with driver.session() as session:
+        # The UNWIND batches look users up by id
+        await Neo4jService(driver, settings.neo4j_database).ensure_schema()
+        
+        async with driver.session(database=settings.neo4j_database) as session:
+            # Answered from the count store, no scan
+            result = await session.run("MATCH (u:User) RETURN count(u) AS total")
+            total = (await result.single())["total"]
+            if total == 0:
+                print("No users found; nothing to seed")
+                return
+            frac = min(1.0, limit * OVERSAMPLE / total)
+            
+            # Bernoulli sample in one pass instead of sorting every user
+            # by a random key
             result = await session.run(
                 """
                 MATCH (u:User)
                 WITH u, rand() AS r
-                ORDER BY r
+                WHERE r < $frac
+                RETURN u.id AS id, u.name AS name
                 LIMIT $limit
-                CREATE (u)-[:POSTED]->(:Post {
-                    id: randomUUID(),
-                    content: "This is a sample post by " + u.name + ".",
-                    createdAt: datetime()
-                })
-                RETURN count(*) as created
                 """,
-                limit=limit
+                limit=limit,
+                frac=frac
             )
-            record = await result.single()
-            print(f"Created {record['created']} posts for random users")
+            
+            # Post payloads are generated client-side and sent via UNWIND
+            rows = [
+                {
+                    "uid": record["id"],
+                    "pid": str(uuid4()),
+                    "content": f"This is a sample post by {record['name']}.",
+                }
+                async for record in result
+            ]
+            
+            # One managed, retryable write transaction per batch
+            created = 0
+            for start in range(0, len(rows), BATCH_SIZE):
+                created += await session.execute_write(
+                    _create_posts, rows[start:start + BATCH_SIZE]
+                )
+            print(f"Created {created} posts for random users")
             
     finally:
-        await driver.close()
+        if owns_driver:
+            await driver.close()
 
 
 if __name__ == "__main__":
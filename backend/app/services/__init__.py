@@ -1,5 +1,6 @@
 # Services
 
-from app.services.neo4j_service import Neo4jService, UserProfile
+from app.models.user import UserProfile
+from app.services.neo4j_service import Neo4jService
 
 __all__ = ["Neo4jService", "UserProfile"]
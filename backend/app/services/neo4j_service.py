@@ -5,37 +5,83 @@ This service provides methods for interacting with the Neo4j database
 for user-related operations including creation, retrieval, and validation.
 """
 
-from typing import Optional
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
-from neo4j import AsyncSession
-from pydantic import BaseModel
+import msgspec
+from neo4j import AsyncDriver, Record, RoutingControl
 
+from app.models.user import UserPage, UserProfile
 
-class UserProfile(BaseModel):
-    """User profile data model for Neo4j operations.
-    Schema: bio, email, id, name, username, avatar, followers_count, following_count
+logger = logging.getLogger(__name__)
+
+# Uniqueness constraints also create the range indexes behind every
+# lookup by id or username (username_ci is the lower-cased copy used for
+# case-insensitive uniqueness, and its index serves the search prefix
+# match on username); the name_ci text index serves the search prefix
+# match on name, and the followers_count index backs the popular-users
+# ranking. The text indexes on the raw username and name are no longer
+# read by any query, so deployments that created them drop them.
+SCHEMA_STATEMENTS = (
+    "CREATE CONSTRAINT user_id IF NOT EXISTS "
+    "FOR (u:User) REQUIRE u.id IS UNIQUE",
+    "CREATE CONSTRAINT user_username IF NOT EXISTS "
+    "FOR (u:User) REQUIRE u.username IS UNIQUE",
+    "CREATE CONSTRAINT user_username_ci IF NOT EXISTS "
+    "FOR (u:User) REQUIRE u.username_ci IS UNIQUE",
+    "CREATE TEXT INDEX user_name_ci_text IF NOT EXISTS "
+    "FOR (u:User) ON (u.name_ci)",
+    "CREATE INDEX user_followers_count IF NOT EXISTS "
+    "FOR (u:User) ON (u.followers_count)",
+    "DROP INDEX user_username_text IF EXISTS",
+    "DROP INDEX user_name_text IF EXISTS",
+)
+
+# Users imported before these properties were introduced (or loaded
+# straight from the dataset) lack them; derive them once from the data.
+# Each statement only touches users still missing the property.
+BACKFILL_STATEMENTS = (
     """
-    id: str
-    name: str
-    username: str
-    email: str
-    bio: str = ""
-    avatar: str = "avatar_1"
-    followers_count: int = 0
-    following_count: int = 0
+    MATCH (u:User)
+    WHERE u.followers_count IS NULL OR u.following_count IS NULL
+    CALL {
+        WITH u
+        SET u.followers_count = COUNT { (u)<-[:FOLLOWS]-() },
+            u.following_count = COUNT { (u)-[:FOLLOWS]->() }
+    } IN TRANSACTIONS OF 1000 ROWS
+    """,
+    """
+    MATCH (u:User)
+    WHERE u.username_ci IS NULL AND u.username IS NOT NULL
+    CALL {
+        WITH u
+        SET u.username_ci = toLower(u.username)
+    } IN TRANSACTIONS OF 1000 ROWS
+    """,
+    """
+    MATCH (u:User)
+    WHERE u.name_ci IS NULL AND u.name IS NOT NULL
+    CALL {
+        WITH u
+        SET u.name_ci = toLower(u.name)
+    } IN TRANSACTIONS OF 1000 ROWS
+    """,
+)
 
 
-class FeedPostAuthor(BaseModel):
+class FeedPostAuthor(msgspec.Struct, frozen=True, gc=False):
     """Author information for a feed post."""
     id: str
     name: str
     username: str
 
 
-class FeedPost(BaseModel):
+class FeedPost(msgspec.Struct, frozen=True, gc=False):
     """Feed post data model for displaying posts from followed users.
     
     Contains post content and author information needed for feed display.
+    Built from trusted Neo4j data, so it is a msgspec Struct rather than a
+    validated pydantic model.
     """
     id: str
     content: str
@@ -43,6 +89,321 @@ class FeedPost(BaseModel):
     author: FeedPostAuthor
 
 
+# Cypher for the service methods, one constant per method. Neo4j caches
+# query plans keyed on the exact query text, so keeping each statement
+# fixed (and every parameter a stable type) lets it be planned once per
+# server instead of on every call.
+
+CREATE_USER_QUERY = """
+CREATE (u:User {
+    id: $id,
+    name: $name,
+    name_ci: $name_ci,
+    username: $username,
+    username_ci: $username_ci,
+    email: $email,
+    bio: $bio,
+    avatar: $avatar,
+    followers_count: 0,
+    following_count: 0
+})
+"""
+
+GET_USER_BY_ID_QUERY = """
+MATCH (u:User {id: $user_id})
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar
+"""
+
+GET_USER_BY_USERNAME_QUERY = """
+MATCH (u:User {username: $username})
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar
+"""
+
+GET_USER_WITH_FOLLOW_COUNTS_QUERY = """
+MATCH (u:User {id: $user_id})
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar,
+       coalesce(u.followers_count, 0) AS followers_count,
+       coalesce(u.following_count, 0) AS following_count
+"""
+
+GET_USER_WITH_FOLLOW_COUNTS_BY_USERNAME_QUERY = """
+MATCH (u:User {username: $username})
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar,
+       coalesce(u.followers_count, 0) AS followers_count,
+       coalesce(u.following_count, 0) AS following_count
+"""
+
+GET_PROFILE_BUNDLE_QUERY = """
+MATCH (u:User {id: $user_id})
+CALL {
+    WITH u
+    MATCH (f:User)-[:FOLLOWS]->(u)
+    WITH f, toString(f.id) AS f_id
+    ORDER BY f_id
+    LIMIT $limit + 1
+    RETURN collect(f {
+        id: f_id,
+        .name,
+        .username,
+        .email,
+        bio: coalesce(f.bio, ""),
+        avatar: coalesce(f.avatar, "avatar_1")
+    }) AS followers
+}
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar,
+       coalesce(u.followers_count, 0) AS followers_count,
+       coalesce(u.following_count, 0) AS following_count,
+       followers
+"""
+
+# One round-trip reading the denormalized counters maintained by
+# follow_user/unfollow_user
+GET_FOLLOW_COUNTS_QUERY = """
+MATCH (u:User {id: $user_id})
+RETURN coalesce(u.followers_count, 0) AS followers,
+       coalesce(u.following_count, 0) AS following
+"""
+
+IS_USERNAME_AVAILABLE_QUERY = """
+RETURN EXISTS {
+    MATCH (u:User {username_ci: $username_ci})
+} AS taken
+"""
+
+IS_USERNAME_AVAILABLE_FOR_USER_QUERY = """
+RETURN EXISTS {
+    MATCH (u:User {username_ci: $username_ci})
+    WHERE u.id <> $current_user_id
+} AS taken
+"""
+
+UPDATE_USER_QUERY = """
+MATCH (u:User {id: $user_id})
+SET u.name = $name,
+    u.name_ci = $name_ci,
+    u.username = $username,
+    u.username_ci = $username_ci,
+    u.bio = $bio,
+    u.avatar = $avatar
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar
+"""
+
+# Posts with a missing or empty id or content are left out of the feed
+GET_FEED_POSTS_QUERY = """
+MATCH (me:User {id: $userId})-[:FOLLOWS]->(followed:User)-[:POSTED]->(post:Post)
+WHERE coalesce(post.id, "") <> "" AND coalesce(post.content, "") <> ""
+RETURN post.id AS id,
+       post.content AS content,
+       post.createdAt AS createdAt,
+       followed.id AS author_id,
+       followed.name AS author_name,
+       followed.username AS author_username
+ORDER BY post.createdAt DESC
+"""
+
+# Counter updates fall back to counting relationships for users the
+# backfill has not reached (e.g. it failed at startup), so a follow never
+# stores a count derived from a missing property. The count runs after
+# the relationship was created or deleted, so it already includes that
+# change.
+FOLLOW_USER_QUERY = """
+MATCH (u:User {id: $user_id})
+WITH u
+MATCH (t:User {id: $target_id})
+MERGE (u)-[:FOLLOWS]->(t)
+ON CREATE SET
+    u.following_count = coalesce(
+        u.following_count + 1, COUNT { (u)-[:FOLLOWS]->() }
+    ),
+    t.followers_count = coalesce(
+        t.followers_count + 1, COUNT { (t)<-[:FOLLOWS]-() }
+    )
+RETURN u.id as source, t.id as target
+"""
+
+FOLLOW_USERS_BULK_QUERY = """
+MATCH (u:User {id: $user_id})
+UNWIND $target_ids AS target_id
+MATCH (t:User {id: target_id})
+WHERE t <> u
+MERGE (u)-[:FOLLOWS]->(t)
+ON CREATE SET
+    u.following_count = coalesce(
+        u.following_count + 1, COUNT { (u)-[:FOLLOWS]->() }
+    ),
+    t.followers_count = coalesce(
+        t.followers_count + 1, COUNT { (t)<-[:FOLLOWS]-() }
+    )
+RETURN t.id AS target
+"""
+
+UNFOLLOW_USER_QUERY = """
+MATCH (u:User {id: $user_id})-[f:FOLLOWS]->(t:User {id: $target_id})
+DELETE f
+WITH u, t, count(f) AS removed
+SET u.following_count = coalesce(
+        u.following_count - removed, COUNT { (u)-[:FOLLOWS]->() }
+    ),
+    t.followers_count = coalesce(
+        t.followers_count - removed, COUNT { (t)<-[:FOLLOWS]-() }
+    )
+RETURN removed
+"""
+
+# The keyset seeks and sorts on the same string form of the ID that is
+# handed out as the cursor: dataset IDs may be stored as numbers, and a
+# number compared with a string cursor is null, not greater
+GET_FOLLOWING_QUERY = """
+MATCH (u:User {id: $user_id})-[:FOLLOWS]->(f:User)
+WITH f, toString(f.id) AS f_id
+WHERE $cursor IS NULL OR f_id > $cursor
+ORDER BY f_id
+LIMIT $limit + 1
+RETURN collect(f {
+    id: f_id,
+    .name,
+    .username,
+    .email,
+    bio: coalesce(f.bio, ""),
+    avatar: coalesce(f.avatar, "avatar_1")
+}) AS users
+"""
+
+GET_FOLLOWERS_QUERY = """
+MATCH (f:User)-[:FOLLOWS]->(u:User {id: $user_id})
+WITH f, toString(f.id) AS f_id
+WHERE $cursor IS NULL OR f_id > $cursor
+ORDER BY f_id
+LIMIT $limit + 1
+RETURN collect(f {
+    id: f_id,
+    .name,
+    .username,
+    .email,
+    bio: coalesce(f.bio, ""),
+    avatar: coalesce(f.avatar, "avatar_1")
+}) AS users
+"""
+
+GET_MUTUAL_CONNECTIONS_QUERY = """
+MATCH (:User {id: $user1})-[:FOLLOWS]->(m:User)<-[:FOLLOWS]-(:User {id: $user2})
+WITH DISTINCT m
+ORDER BY coalesce(m.followers_count, 0) DESC, m.id
+LIMIT $limit
+RETURN toString(m.id) AS id,
+       m.name AS name,
+       m.username AS username,
+       m.email AS email,
+       coalesce(m.bio, "") AS bio,
+       coalesce(m.avatar, "avatar_1") AS avatar,
+       coalesce(m.followers_count, 0) AS followers_count,
+       coalesce(m.following_count, 0) AS following_count
+"""
+
+GET_FOLLOWING_SUGGESTIONS_QUERY = """
+MATCH (u1:User {id:$user_id})-[:FOLLOWS]->(u2:User)
+WITH u1, collect(u2) AS followed
+UNWIND followed AS u2
+MATCH (u2)-[:FOLLOWS]->(c:User)
+WHERE c <> u1 AND NOT c IN followed
+WITH c, count(DISTINCT u2) AS mutualCount
+ORDER BY mutualCount DESC
+LIMIT $limit
+RETURN toString(c.id) AS id,
+       c.name AS name,
+       c.username AS username,
+       c.email AS email,
+       coalesce(c.bio, "") AS bio,
+       coalesce(c.avatar, "avatar_1") AS avatar,
+       coalesce(c.followers_count, 0) AS followers_count,
+       coalesce(c.following_count, 0) AS following_count
+"""
+
+SEARCH_USERS_QUERY = """
+MATCH (u:User)
+WHERE u.id <> $user_id
+  AND (u.username_ci STARTS WITH $search_term
+       OR u.name_ci STARTS WITH $search_term)
+WITH u
+ORDER BY u.username
+SKIP $skip
+LIMIT $limit
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar,
+       coalesce(u.followers_count, 0) AS followers_count,
+       coalesce(u.following_count, 0) AS following_count
+"""
+
+# Ranked on the denormalized, indexed followers_count rather than
+# aggregating every FOLLOWS relationship; the id tiebreak keeps
+# offsets stable between pages
+EXPLORE_POPULAR_USERS_QUERY = """
+MATCH (u:User)
+WHERE u.followers_count > 0
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar,
+       u.followers_count AS followers_count,
+       coalesce(u.following_count, 0) AS following_count
+ORDER BY u.followers_count DESC, u.id
+SKIP $skip
+LIMIT $limit + 1
+"""
+
+GET_ALL_USERS_EXCEPT_QUERY = """
+MATCH (u:User)
+WHERE u.id <> $user_id
+  AND ($cursor IS NULL OR u.username > $cursor)
+RETURN toString(u.id) AS id,
+       u.name AS name,
+       u.username AS username,
+       u.email AS email,
+       coalesce(u.bio, "") AS bio,
+       coalesce(u.avatar, "avatar_1") AS avatar,
+       coalesce(u.followers_count, 0) AS followers_count,
+       coalesce(u.following_count, 0) AS following_count
+ORDER BY u.username
+LIMIT $limit + 1
+"""
+
+
 class Neo4jService:
     """
     Service class for Neo4j database operations.
@@ -53,14 +414,140 @@ class Neo4jService:
     - Checking username availability
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, driver: AsyncDriver, database: str = "neo4j"):
         """
-        Initialize the Neo4j service with a database session.
+        Initialize the Neo4j service with the shared driver.
+        
+        Queries run through ``driver.execute_query`` so each call borrows a
+        pooled connection instead of holding a session for the whole request.
         
         Args:
-            session: An async Neo4j session for database operations.
+            driver: The process-wide async Neo4j driver.
+            database: Name of the database to run queries against.
+        """
+        self._driver = driver
+        self._database = database
+
+    @staticmethod
+    def _user_page(
+        users: list[UserProfile],
+        limit: int,
+        cursor_for: Callable[[UserProfile], str],
+    ) -> UserPage:
         """
-        self._session = session
+        Build a UserPage from up to ``limit + 1`` fetched users.
+        
+        The extra row only signals that another page exists; it is dropped
+        and the cursor is taken from the last user actually returned.
+        """
+        if len(users) > limit:
+            users = users[:limit]
+            return UserPage(items=users, next_cursor=cursor_for(users[-1]))
+        return UserPage(items=users)
+
+    @staticmethod
+    def _profiles(records: list[Record]) -> list[UserProfile]:
+        """
+        Build profiles from rows of the eight UserProfile columns, in order.
+        
+        Records are tuples, so unpacking them positionally skips the
+        per-field key lookups of ``model_construct(**record)``; this is
+        what the flat listing queries return many rows through.
+        """
+        return [
+            UserProfile.model_construct(
+                id=user_id,
+                name=name,
+                username=username,
+                email=email,
+                bio=bio,
+                avatar=avatar,
+                followers_count=followers_count,
+                following_count=following_count,
+            )
+            for (
+                user_id, name, username, email, bio, avatar,
+                followers_count, following_count,
+            ) in records
+        ]
+
+    @staticmethod
+    async def _iter_pages(
+        fetch_page: Callable[[Optional[str]], Awaitable[UserPage]],
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[UserProfile]:
+        """
+        Yield the users of successive keyset pages until the last one.
+        
+        Each page is a short, buffered read, so a slow consumer (such as an
+        NDJSON response) only holds a pooled connection while a page is
+        fetched, and at most one page is in memory at a time.
+        """
+        while True:
+            page = await fetch_page(cursor)
+            for user in page.items:
+                yield user
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    async def _read(self, query: str, **params: Any) -> list[Record]:
+        """Run a read query in a managed transaction and return its records."""
+        records, _, _ = await self._driver.execute_query(
+            query,
+            params,
+            database_=self._database,
+            routing_=RoutingControl.READ,
+        )
+        return records
+
+    async def _write(self, query: str, **params: Any) -> list[Record]:
+        """Run a write query in a managed transaction and return its records."""
+        records, _, _ = await self._driver.execute_query(
+            query,
+            params,
+            database_=self._database,
+            routing_=RoutingControl.WRITE,
+        )
+        return records
+
+    async def _run_maintenance(self, statements: tuple[str, ...]) -> None:
+        """
+        Run schema or migration statements as auto-commit queries.
+        
+        Auto-commit rather than execute_query: DDL needs no retries (and
+        an unreachable database should not stall startup in the retry
+        loop), and CALL ... IN TRANSACTIONS is only allowed outside an
+        explicit transaction. Failures are logged, not raised, so the API
+        can still start; queries then run without the affected index or
+        property.
+        """
+        async with self._driver.session(database=self._database) as session:
+            for statement in statements:
+                try:
+                    result = await session.run(statement)
+                    await result.consume()
+                except Exception:
+                    logger.exception("Failed to run maintenance statement: %s", statement)
+
+    async def ensure_schema(self) -> None:
+        """
+        Create the User constraints and indexes if they do not exist yet.
+        
+        Idempotent (every statement is IF NOT EXISTS); called once at
+        startup and by the seed scripts.
+        """
+        await self._run_maintenance(SCHEMA_STATEMENTS)
+
+    async def backfill_user_properties(self) -> None:
+        """
+        Populate derived User properties that older nodes are missing.
+        
+        Covers the denormalized follow counts and the lower-cased
+        username_ci and name_ci. After the first run the statements only
+        scan User nodes without writing anything.
+        """
+        await self._run_maintenance(BACKFILL_STATEMENTS)
 
     async def create_user(self, profile: UserProfile) -> None:
         """
@@ -72,21 +559,13 @@ class Neo4jService:
         Args:
             profile: UserProfile containing all user data to store.
         """
-        query = """
-        CREATE (u:User {
-            id: $id,
-            name: $name,
-            username: $username,
-            email: $email,
-            bio: $bio,
-            avatar: $avatar
-        })
-        """
-        await self._session.run(
-            query,
+        await self._write(
+            CREATE_USER_QUERY,
             id=profile.id,
             name=profile.name,
+            name_ci=profile.name.lower(),
             username=profile.username,
+            username_ci=profile.username.lower(),
             email=profile.email,
             bio=profile.bio,
             avatar=profile.avatar
@@ -105,25 +584,12 @@ class Neo4jService:
         Returns:
             UserProfile if found, None otherwise.
         """
-        query = """
-        MATCH (u:User {id: $user_id})
-        RETURN u
-        """
-        result = await self._session.run(query, user_id=user_id)
-        record = await result.single()
-
-        if record is None:
+        records = await self._read(GET_USER_BY_ID_QUERY, user_id=user_id)
+        if not records:
             return None
 
-        node = record["u"]
-        return UserProfile(
-            id=str(node["id"]),
-            name=node["name"],
-            username=node["username"],
-            email=node["email"],
-            bio=node.get("bio", ""),
-            avatar=node.get("avatar", "avatar_1")
-        )
+        # Columns are named after the UserProfile fields
+        return UserProfile.model_construct(**records[0])
 
     async def get_user_by_username(self, username: str) -> Optional[UserProfile]:
         """
@@ -135,26 +601,103 @@ class Neo4jService:
         Returns:
             UserProfile if found, None otherwise.
         """
-        query = """
-        MATCH (u:User {username: $username})
-        RETURN u
+        records = await self._read(GET_USER_BY_USERNAME_QUERY, username=username)
+        if not records:
+            return None
+
+        # Columns are named after the UserProfile fields
+        return UserProfile.model_construct(**records[0])
+
+    async def get_user_with_follow_counts(
+        self,
+        user_id: str
+    ) -> Optional[tuple[UserProfile, int, int]]:
+        """
+        Retrieve a user profile and its follow counts in one query.
+        
+        The counts are the denormalized ``followers_count`` and
+        ``following_count`` properties kept up to date by follow_user and
+        unfollow_user, so this is a single node read.
+        
+        Args:
+            user_id: The user identifier.
+            
+        Returns:
+            Tuple of (UserProfile, followers_count, following_count) if
+            found, None otherwise.
         """
-        result = await self._session.run(query, username=username)
-        record = await result.single()
+        records = await self._read(GET_USER_WITH_FOLLOW_COUNTS_QUERY, user_id=user_id)
+        return self._user_with_follow_counts(records)
 
-        if record is None:
+    async def get_user_with_follow_counts_by_username(
+        self,
+        username: str
+    ) -> Optional[tuple[UserProfile, int, int]]:
+        """
+        Retrieve a user profile by username and its follow counts in one query.
+        
+        Args:
+            username: The username to look up.
+            
+        Returns:
+            Tuple of (UserProfile, followers_count, following_count) if
+            found, None otherwise.
+        """
+        records = await self._read(
+            GET_USER_WITH_FOLLOW_COUNTS_BY_USERNAME_QUERY,
+            username=username,
+        )
+        return self._user_with_follow_counts(records)
+
+    async def get_profile_bundle(
+        self,
+        user_id: str,
+        followers_limit: int = 10,
+    ) -> Optional[tuple[UserProfile, int, int, UserPage]]:
+        """
+        Retrieve everything the profile page shows in one query.
+        
+        The first page of followers comes from a CALL subquery on the
+        already-matched user node, and uses the same keyset as
+        get_followers so its cursor continues there.
+        
+        Args:
+            user_id: The user identifier.
+            followers_limit: Size of the followers page.
+            
+        Returns:
+            Tuple of (UserProfile, followers_count, following_count,
+            first followers page) if found, None otherwise.
+        """
+        records = await self._read(
+            GET_PROFILE_BUNDLE_QUERY,
+            user_id=user_id,
+            limit=int(followers_limit),
+        )
+        if not records:
             return None
 
-        node = record["u"]
-        return UserProfile(
-            id=str(node["id"]),
-            name=node["name"],
-            username=node["username"],
-            email=node["email"],
-            bio=node.get("bio", ""),
-            avatar=node.get("avatar", "avatar_1")
+        row = dict(records[0])
+        followers = [UserProfile.model_construct(**user) for user in row.pop("followers")]
+        profile = UserProfile.model_construct(**row)
+        return (
+            profile,
+            profile.followers_count,
+            profile.following_count,
+            self._user_page(followers, followers_limit, lambda user: user.id),
         )
 
+    @staticmethod
+    def _user_with_follow_counts(
+        records: list[Record]
+    ) -> Optional[tuple[UserProfile, int, int]]:
+        """Build the (profile, followers, following) tuple from a query result."""
+        if not records:
+            return None
+
+        profile = UserProfile.model_construct(**records[0])
+        return (profile, profile.followers_count, profile.following_count)
+
     async def get_follow_counts(self, user_id: str) -> tuple[int, int]:
         """
         Get the follower and following counts for a user.
@@ -165,31 +708,19 @@ class Neo4jService:
         Returns:
             Tuple of (followers_count, following_count).
         """
-        # Use separate counts to avoid cartesian product issues
-        followers_query = """
-        MATCH (follower:User)-[:FOLLOWS]->(u:User {id: $user_id})
-        RETURN count(follower) as count
-        """
-        following_query = """
-        MATCH (u:User {id: $user_id})-[:FOLLOWS]->(following:User)
-        RETURN count(following) as count
-        """
+        records = await self._read(GET_FOLLOW_COUNTS_QUERY, user_id=user_id)
+        if not records:
+            return (0, 0)
 
-        followers_result = await self._session.run(followers_query, user_id=user_id)
-        followers_record = await followers_result.single()
-        followers_count = followers_record["count"] if followers_record else 0
-
-        following_result = await self._session.run(following_query, user_id=user_id)
-        following_record = await following_result.single()
-        following_count = following_record["count"] if following_record else 0
-
-        return (followers_count, following_count)
+        record = records[0]
+        return (record["followers"], record["following"])
 
     async def is_username_available(self, username: str) -> bool:
         """
         Check if a username is available (not already taken).
         
-        Performs a case-insensitive check to ensure username uniqueness.
+        Performs a case-insensitive check to ensure username uniqueness,
+        served by the unique index on the lower-cased username_ci property.
         
         Args:
             username: The username to check for availability.
@@ -197,15 +728,12 @@ class Neo4jService:
         Returns:
             True if the username is available, False if already taken.
         """
-        query = """
-        MATCH (u:User)
-        WHERE toLower(u.username) = toLower($username)
-        RETURN count(u) as count
-        """
-        result = await self._session.run(query, username=username)
-        record = await result.single()
+        records = await self._read(
+            IS_USERNAME_AVAILABLE_QUERY,
+            username_ci=username.lower(),
+        )
 
-        return record["count"] == 0
+        return not records[0]["taken"]
 
     async def is_username_available_for_user(
         self,
@@ -216,7 +744,8 @@ class Neo4jService:
         Check if a username is available, excluding the current user.
         
         Allows a user to keep their own username during profile updates.
-        Performs a case-insensitive check to ensure username uniqueness.
+        Performs a case-insensitive check to ensure username uniqueness,
+        served by the unique index on the lower-cased username_ci property.
         
         Args:
             username: The username to check for availability.
@@ -228,20 +757,13 @@ class Neo4jService:
             
         Requirements: 3.3, 3.4
         """
-        query = """
-        MATCH (u:User)
-        WHERE toLower(u.username) = toLower($username)
-          AND u.id <> $current_user_id
-        RETURN count(u) as count
-        """
-        result = await self._session.run(
-            query,
-            username=username,
+        records = await self._read(
+            IS_USERNAME_AVAILABLE_FOR_USER_QUERY,
+            username_ci=username.lower(),
             current_user_id=current_user_id
         )
-        record = await result.single()
 
-        return record["count"] == 0
+        return not records[0]["taken"]
 
     async def update_user(
         self,
@@ -255,7 +777,8 @@ class Neo4jService:
         Update user profile in Neo4j.
         
         Updates the user's name, username, bio, and avatar fields.
-        The username uniqueness should be verified before calling this method.
+        The username uniqueness should be verified before calling this method;
+        the username_ci constraint rejects a conflicting concurrent update.
         
         Args:
             user_id: The user identifier.
@@ -269,39 +792,24 @@ class Neo4jService:
             
         Raises:
             ValueError: If user not found.
+            ConstraintError: If another user already holds the username.
             
         Requirements: 2.3, 3.5, 4.3, 5.3
         """
-        query = """
-        MATCH (u:User {id: $user_id})
-        SET u.name = $name,
-            u.username = $username,
-            u.bio = $bio,
-            u.avatar = $avatar
-        RETURN u
-        """
-        result = await self._session.run(
-            query,
+        records = await self._write(
+            UPDATE_USER_QUERY,
             user_id=user_id,
             name=name,
+            name_ci=name.lower(),
             username=username,
+            username_ci=username.lower(),
             bio=bio,
             avatar=avatar
         )
-        record = await result.single()
-
-        if record is None:
+        if not records:
             raise ValueError("User not found")
 
-        node = record["u"]
-        return UserProfile(
-            id=str(node["id"]),
-            name=node["name"],
-            username=node["username"],
-            email=node["email"],
-            bio=node["bio"],
-            avatar=node["avatar"]
-        )
+        return UserProfile.model_construct(**records[0])
 
     async def get_feed_posts(self, user_id: str) -> list[FeedPost]:
         """
@@ -316,33 +824,22 @@ class Neo4jService:
         Returns:
             List of FeedPost objects ordered by creation date (newest first).
         """
-        query = """
-        MATCH (me:User {id: $userId})-[:FOLLOWS]->(followed:User)-[:POSTED]->(post:Post)
-        RETURN post, followed
-        ORDER BY post.createdAt DESC
-        """
-        result = await self._session.run(query, userId=user_id)
-        records = await result.data()
+        records = await self._read(GET_FEED_POSTS_QUERY, userId=user_id)
 
         feed_posts = []
         for record in records:
-            post = record["post"]
-            followed = record["followed"]
-            # Skip posts with missing required fields
-            if not post.get("id") or not post.get("content"):
-                continue
+            post_id, content, created_at, author_id, author_name, author_username = record
             # Convert createdAt to ISO string if it's a DateTime object
-            created_at = post.get("createdAt", "")
             if hasattr(created_at, "isoformat"):
                 created_at = created_at.isoformat()
             feed_posts.append(FeedPost(
-                id=str(post["id"]),
-                content=post["content"],
-                createdAt=str(created_at),
+                id=str(post_id),
+                content=content,
+                createdAt=str(created_at or ""),
                 author=FeedPostAuthor(
-                    id=str(followed["id"]),
-                    name=followed["name"],
-                    username=followed["username"]
+                    id=str(author_id),
+                    name=author_name,
+                    username=author_username
                 )
             ))
 
@@ -352,218 +849,294 @@ class Neo4jService:
         """
         Create a FOLLOWS relationship from user_id -> target_id.
         Requirements: UC-5 Follow Another User
+        
+        The denormalized follow counts are only bumped when the
+        relationship is actually created, so repeat follows are no-ops.
         """
-        query = """
-        MATCH (u:User {id: $user_id}), (t:User {id: $target_id})
-        MERGE (u)-[:FOLLOWS]->(t)
-        RETURN u.id as source, t.id as target
-        """
-        result = await self._session.run(query, user_id=user_id, target_id=target_id)
-        record = await result.single()
+        records = await self._write(
+            FOLLOW_USER_QUERY,
+            user_id=user_id,
+            target_id=target_id,
+        )
+        record = records[0] if records else None
         if record is None:
-            # Log for debugging - one or both users don't exist
-            print(f"WARNING: follow_user failed - user_id={user_id}, target_id={target_id} - one or both users not found")
+            logger.warning(
+                "follow_user: one or both users not found (user_id=%s, target_id=%s)",
+                user_id,
+                target_id,
+            )
+
+    async def follow_users_bulk(
+        self,
+        user_id: str,
+        target_ids: list[str]
+    ) -> list[str]:
+        """
+        Create FOLLOWS relationships from user_id to every target in one query.
+        
+        Same semantics as follow_user per target (counts only change for
+        newly created relationships), but a single round-trip for the
+        whole batch. Duplicate IDs, unknown IDs and user_id itself are
+        skipped.
+        
+        Args:
+            user_id: The following user.
+            target_ids: IDs of the users to follow.
+            
+        Returns:
+            IDs of the targets that are now followed.
+        """
+        records = await self._write(
+            FOLLOW_USERS_BULK_QUERY,
+            user_id=user_id,
+            target_ids=list(dict.fromkeys(target_ids))
+        )
+        return [record["target"] for record in records]
 
-    async def unfollow_user(self, user_id: str, target_id: str) -> None:
+    async def unfollow_user(self, user_id: str, target_id: str) -> bool:
         """
         Remove a FOLLOWS relationship.
         Requirements: UC-6 Unfollow a User
+        
+        Decrements the denormalized follow counts by the number of
+        relationships actually deleted, in the same transaction, so
+        repeat unfollows are no-ops.
+        
+        Returns:
+            True if a relationship was removed, False if none existed.
         """
-        query = """
-        MATCH (u:User {id: $user_id})-[f:FOLLOWS]->(t:User {id: $target_id})
-        DELETE f
-        """
-        result = await self._session.run(query, user_id=user_id, target_id=target_id)
-        await result.consume()
+        records = await self._write(
+            UNFOLLOW_USER_QUERY,
+            user_id=user_id,
+            target_id=target_id,
+        )
+        # The aggregation only yields a row when a relationship matched
+        return bool(records)
 
-    async def get_following(self, user_id: str) -> list[UserProfile]:
+    async def get_following(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> UserPage:
         """
         Get list of users that current user is following.
         Requirements: UC-7 View Connections
+        
+        Paginated by keyset on user ID; cursor is the last ID of the
+        previous page.
         """
-        query = """
-        MATCH (u:User {id: $user_id})-[:FOLLOWS]->(f:User)
-        RETURN f
-        """
-        result = await self._session.run(query, user_id=user_id)
-        records = await result.data()
+        records = await self._read(
+            GET_FOLLOWING_QUERY,
+            user_id=user_id,
+            limit=int(limit),
+            cursor=cursor,
+        )
 
-        following = []
-        for record in records:
-            node = record["f"]
-            following.append(UserProfile(
-                id=str(node["id"]),
-                name=node["name"],
-                username=node["username"],
-                email=node["email"],
-                bio=node.get("bio", ""),
-                avatar=node.get("avatar", "avatar_1")
-            ))
-        return following
+        # The aggregation always yields exactly one record
+        users = [UserProfile.model_construct(**user) for user in records[0]["users"]]
+        return self._user_page(users, limit, lambda user: user.id)
 
-    async def get_followers(self, user_id: str) -> list[UserProfile]:
+    async def get_followers(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> UserPage:
         """
         Get list of users who follow the current user.
         Requirements: UC-7 View Connections
+        
+        Paginated by keyset on user ID; cursor is the last ID of the
+        previous page.
+        """
+        records = await self._read(
+            GET_FOLLOWERS_QUERY,
+            user_id=user_id,
+            limit=int(limit),
+            cursor=cursor,
+        )
+
+        # The aggregation always yields exactly one record
+        users = [UserProfile.model_construct(**user) for user in records[0]["users"]]
+        return self._user_page(users, limit, lambda user: user.id)
+
+    async def iter_following(
+        self,
+        user_id: str,
+        page_size: int = 200,
+    ) -> AsyncIterator[UserProfile]:
         """
-        query = """
-        MATCH (f:User)-[:FOLLOWS]->(u:User {id: $user_id})
-        RETURN f
+        Stream every user that user_id is following, ordered by ID.
+        Requirements: UC-7 View Connections
+        
+        Walks get_following page by page; see _iter_pages.
         """
-        result = await self._session.run(query, user_id=user_id)
-        records = await result.data()
+        async for user in self._iter_pages(
+            lambda cursor: self.get_following(user_id, page_size, cursor)
+        ):
+            yield user
 
-        followers = []
-        for record in records:
-            node = record["f"]
-            followers.append(UserProfile(
-                id=str(node["id"]),
-                name=node["name"],
-                username=node["username"],
-                email=node["email"],
-                bio=node.get("bio", ""),
-                avatar=node.get("avatar", "avatar_1")
-            ))
-        return followers
+    async def iter_followers(
+        self,
+        user_id: str,
+        page_size: int = 200,
+    ) -> AsyncIterator[UserProfile]:
+        """
+        Stream every user who follows user_id, ordered by ID.
+        Requirements: UC-7 View Connections
+        
+        Walks get_followers page by page; see _iter_pages.
+        """
+        async for user in self._iter_pages(
+            lambda cursor: self.get_followers(user_id, page_size, cursor)
+        ):
+            yield user
 
-    async def get_mutual_connections(self, user1: str, user2: str) -> list[UserProfile]:
+    async def get_mutual_connections(
+        self,
+        user1: str,
+        user2: str,
+        limit: int = 50,
+    ) -> list[UserProfile]:
         """
         Get mutual connections between two users.
         Requirements: UC-8 Mutual Connections
-         """
-        query = """
-        MATCH (u1:User {id: $user1})-[:FOLLOWS]->(m:User),
-            (u2:User {id: $user2})-[:FOLLOWS]->(m)
-        RETURN m
+        
+        Duplicate FOLLOWS relationships (e.g. from imported data) would
+        otherwise repeat a user, so matches are made distinct before the
+        most-followed ``limit`` are taken; ties break on user ID so the
+        selection is stable.
         """
-        result = await self._session.run(query, user1=user1, user2=user2)
-        records = await result.data()
+        records = await self._read(
+            GET_MUTUAL_CONNECTIONS_QUERY,
+            user1=user1,
+            user2=user2,
+            limit=int(limit),
+        )
 
-        mutual = []
-        for record in records:
-            node = record["m"]
-            mutual.append(UserProfile(
-                id=str(node["id"]),
-                name=node["name"],
-                username=node["username"],
-                email=node["email"],
-                bio=node.get("bio", ""),
-                avatar=node.get("avatar", "avatar_1")
-            ))
-        return mutual
+        return self._profiles(records)
 
     async def get_following_suggestions(self, user_id:str, limit:int=10) -> list[UserProfile]:
         """
         Get following suggestions for a user.
+        
+        Candidates are followed by people the user follows, ranked by how
+        many of them do; follower counts come from the denormalized
+        property rather than another FOLLOWS expansion.
+        
+        The followed users are collected once, so excluding candidates the
+        user already follows is a list membership test instead of probing
+        FOLLOWS relationships again for every candidate.
         """
-        query = """
-        MATCH (u1:User {id:$user_id})-[:FOLLOWS]->(u2:User)-[:FOLLOWS]->(c:User)
-        WHERE NOT (u1)-[:FOLLOWS]->(c) AND c <> u1
-        WITH c, count(DISTINCT u2) AS mutualCount
-        OPTIONAL MATCH (c)<-[:FOLLOWS]-(follower:User)
-        RETURN c, mutualCount, count(DISTINCT follower) AS followers
-        ORDER BY mutualCount DESC
-        LIMIT 10;
-        """
-        result = await self._session.run(query, user_id=user_id)
-        records = await result.data()
+        records = await self._read(
+            GET_FOLLOWING_SUGGESTIONS_QUERY,
+            user_id=user_id,
+            limit=int(limit),
+        )
 
-        suggestions = []
-        for record in records:
-            node = record["c"]
-            suggestions.append(UserProfile(
-                id=str(node["id"])),
-                name=node["name"],
-                username=node["username"],
-                email=node["email"],
-                bio=node.get("bio", ""),
-                avatar=node.get("avatar", "avatar_1"),
-                followers_count=record.get("followers", 0)
-            )
-        return suggestions
+        return self._profiles(records)
 
-    async def search_users(self, search_term: str, user_id:str) -> list[UserProfile]:
+    async def search_users(
+        self,
+        search_term: str,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> list[UserProfile]:
         """
-        Search for users by username or name.
+        Search for users whose username or name starts with a prefix.
         Used for Search functionality.
+        
+        Matches are ordered by username so skip/limit page through them
+        consistently. Follower counts come from the denormalized property.
+        
+        Args:
+            search_term: Lower-cased search prefix.
+            user_id: ID of the searching user, excluded from results.
+            skip: Number of matches to skip.
+            limit: Maximum number of matches to return.
         """
-        query = """
-        MATCH (u:User)
-        WHERE (toLower(u.name) CONTAINS toLower($search_term) 
-               OR toLower(u.username) CONTAINS toLower($search_term))
-              AND u.id <> $user_id
-        OPTIONAL MATCH (u)<-[:FOLLOWS]-(follower:User)
-        RETURN u, count(DISTINCT follower) AS followers
-        """
-        result = await self._session.run(query, search_term=search_term, user_id=user_id)
-        records = await result.data()
+        records = await self._read(
+            SEARCH_USERS_QUERY,
+            search_term=search_term,
+            user_id=user_id,
+            skip=int(skip),
+            limit=int(limit),
+        )
 
-        users = []
-        for record in records:
-            node = record["u"]
-            users.append(UserProfile(
-                id=str(node["id"])),
-                name=node["name"],
-                username=node["username"],
-                email=node["email"],
-                bio=node.get("bio", ""),
-                avatar=node.get("avatar", "avatar_1"),
-                followers_count=record.get("followers", 0)
-            )
-        return users
+        return self._profiles(records)
 
-    async def explore_popular_users(self, limit:int=10) -> list[UserProfile]:
+    async def explore_popular_users(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> UserPage:
         """
         Get popular users based on follower count.
         Used for Explore Popular Users functionality.
+        
+        The ranking has no stable key to seek on, so the cursor is the
+        offset of the next page.
+        
+        Raises:
+            ValueError: If cursor is not a non-negative integer offset.
         """
-        query = """
-        MATCH (u:User)<-[:FOLLOWS]-(u2:User)
-        RETURN u, count(DISTINCT u2) as followers 
-        ORDER BY followers DESC
-        LIMIT $limit
-        """
-        result = await self._session.run(query, limit=limit)
-        records = await result.data()
+        skip = int(cursor) if cursor else 0
+        if skip < 0:
+            raise ValueError("cursor must be a non-negative offset")
 
-        users = []
-        for record in records:
-            node = record["u"]
-            users.append(UserProfile(
-                id=str(node["id"])),
-                name=node["name"],
-                username=node["username"],
-                email=node["email"],
-                bio=node.get("bio", ""),
-                avatar=node.get("avatar", "avatar_1"),
-                followers_count=record.get("followers", 0),
-                following_count=record.get("following_count", 0)
-            )
-        return users
+        records = await self._read(
+            EXPLORE_POPULAR_USERS_QUERY,
+            skip=skip,
+            limit=int(limit),
+        )
 
-    async def get_all_users_except(self, user_id: str) -> list[UserProfile]:
+        users = self._profiles(records)
+        return self._user_page(users, limit, lambda _: str(skip + limit))
+
+    async def get_all_users_except(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> UserPage:
         """
         Get all users except the current user.
         Used for Explore page.
+        
+        Paginated by keyset on username; cursor is the last username of
+        the previous page.
         """
-        query = """
-        MATCH (u:User)
-        WHERE u.id <> $user_id
-        RETURN u
-        ORDER BY u.username
-        """
-        result = await self._session.run(query, user_id=user_id)
-        records = await result.data()
+        records = await self._read(
+            GET_ALL_USERS_EXCEPT_QUERY,
+            user_id=user_id,
+            limit=int(limit),
+            cursor=cursor,
+        )
 
-        users = []
-        for record in records:
-            node = record["u"]
-            users.append(UserProfile(
-                id=str(node["id"])),
-                name=node["name"],
-                username=node["username"],
-                email=node["email"],
-                bio=node.get("bio", ""),
-                avatar=node.get("avatar", "avatar_1")
-            )
-        return users
+        users = self._profiles(records)
+        return self._user_page(users, limit, lambda user: user.username)
+
+    async def iter_all_users_except(
+        self,
+        user_id: str,
+        after_username: Optional[str] = None,
+        page_size: int = 200,
+    ) -> AsyncIterator[UserProfile]:
+        """
+        Stream every user except the current user, ordered by username.
+        Used for Explore page.
+        
+        Walks get_all_users_except page by page; see _iter_pages.
+        
+        Args:
+            user_id: ID of the current user, excluded from results.
+            after_username: Start after this username, if given.
+            page_size: Users fetched per query.
+        """
+        async for user in self._iter_pages(
+            lambda cursor: self.get_all_users_except(user_id, page_size, cursor),
+            after_username,
+        ):
+            yield user
@@ -281,6 +281,15 @@ export interface ProfileResponse {
   following_count: number;
 }
 
+/**
+ * One page of a paginated user listing.
+ * next_cursor is null on the last page.
+ */
+export interface UserPage {
+  items: ProfileResponse[];
+  next_cursor: string | null;
+}
+
 /**
  * Request type for updating user profile.
  * Requirements: 2.1, 3.1, 4.1, 5.3
@@ -374,12 +383,28 @@ export async function updateProfile(
 // ⭐ SOCIAL GRAPH API (UC-5 → UC-11)
 // =============================================
 
+/**
+ * Follows next_cursor through a paginated listing and returns every item.
+ * Used where callers need the complete list (e.g. follow-status checks).
+ */
+async function fetchAllPages(path: string): Promise<ProfileResponse[]> {
+  const items: ProfileResponse[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const page: UserPage = await apiClient.get<UserPage>(`${path}${query}`);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+}
+
 /**
  * Fetch all users except the current user (Explore Page).
  * Backend: GET /api/social/users
  */
 export async function getAllUsers(): Promise<ProfileResponse[]> {
-  return apiClient.get<ProfileResponse[]>('/api/social/users');
+  return fetchAllPages('/api/social/users');
 }
 
 /**
@@ -390,6 +415,15 @@ export async function followUser(targetId: string): Promise<{ success: boolean;
   return apiClient.post(`/api/social/follow/${targetId}`, {});
 }
 
+/**
+ * Follow several users in one request.
+ * Backend: POST /api/social/follow
+ * Returns the IDs that are now followed (unknown IDs are skipped).
+ */
+export async function followUsers(targetIds: string[]): Promise<{ success: boolean; followed: string[] }> {
+  return apiClient.post('/api/social/follow', { target_ids: targetIds });
+}
+
 /**
  * Unfollow a user (UC-6)
  * Backend: DELETE /api/social/unfollow/{target_id}
@@ -403,7 +437,7 @@ export async function unfollowUser(targetId: string): Promise<{ success: boolean
  * Backend: GET /api/social/following
  */
 export async function getFollowing(): Promise<ProfileResponse[]> {
-  return apiClient.get<ProfileResponse[]>('/api/social/following');
+  return fetchAllPages('/api/social/following');
 }
 
 /**
@@ -411,7 +445,7 @@ export async function getFollowing(): Promise<ProfileResponse[]> {
  * Backend: GET /api/social/following/{user_id}
  */
 export async function getFollowingForUser(userId: string): Promise<ProfileResponse[]> {
-  return apiClient.get<ProfileResponse[]>(`/api/social/following/${userId}`);
+  return fetchAllPages(`/api/social/following/${userId}`);
 }
 
 /**
@@ -419,7 +453,7 @@ export async function getFollowingForUser(userId: string): Promise<ProfileRespon
  * Backend: GET /api/social/followers
  */
 export async function getFollowers(): Promise<ProfileResponse[]> {
-  return apiClient.get<ProfileResponse[]>('/api/social/followers');
+  return fetchAllPages('/api/social/followers');
 }
 
 /**
@@ -427,7 +461,7 @@ export async function getFollowers(): Promise<ProfileResponse[]> {
  * Backend: GET /api/social/followers/{user_id}
  */
 export async function getFollowersForUser(userId: string): Promise<ProfileResponse[]> {
-  return apiClient.get<ProfileResponse[]>(`/api/social/followers/${userId}`);
+  return fetchAllPages(`/api/social/followers/${userId}`);
 }
 
 
@@ -463,5 +497,6 @@ export async function searchUsers(searchTerm: string): Promise<ProfileResponse[]
  * Backend: GET /api/social/popular
  */
 export async function getPopularUsers(): Promise<ProfileResponse[]> {
-  return apiClient.get<ProfileResponse[]>('/api/social/popular');
+  const page = await apiClient.get<UserPage>('/api/social/popular');
+  return page.items;
 }